@@ -1,5 +1,10 @@
 import pygame
 import os
+from bisect import bisect_left
+
+import numpy as np
+
+from fonts import get_font, render_text
 
 # UI Colors & Constants
 BG_COLOR = (40, 40, 40)
@@ -11,6 +16,7 @@ INPUT_ACTIVE_COLOR = (50, 50, 50)
 INPUT_BORDER_COLOR = (255, 255, 255)
 
 EXPORT_MENU_RECT = (180, 120, 460, 440)
+MENU_AREA_RECT = (180, 120, 460, 440)  # covers every modal menu panel
 TOPBAR_HEIGHT = 30
 CONTEXT_MENU_WIDTH = 160
 CONTEXT_MENU_OPTION_HEIGHT = 25
@@ -23,7 +29,7 @@ def draw_button(surface, rect, text, font, active=False):
     color = BTN_COLOR if not active else BTN_ACTIVE_COLOR
     pygame.draw.rect(surface, color, rect)
     pygame.draw.rect(surface, TEXT_COLOR, rect, 1)
-    txt = font.render(text, True, TEXT_COLOR)
+    txt = render_text(font, text, TEXT_COLOR)
     txt_rect = txt.get_rect(center=(rect[0] + rect[2] // 2, rect[1] + rect[3] // 2))
     surface.blit(txt, txt_rect)
 
@@ -33,7 +39,7 @@ def draw_input_field(surface, label, value, pos, font, active=False):
     color = INPUT_ACTIVE_COLOR if active else INPUT_BG_COLOR
     pygame.draw.rect(surface, color, (x, y, 200, 30))
     pygame.draw.rect(surface, INPUT_BORDER_COLOR, (x, y, 200, 30), 2)
-    txt = font.render(f"{label}: {value}", True, TEXT_COLOR)
+    txt = render_text(font, f"{label}: {value}", TEXT_COLOR)
     surface.blit(txt, (x + 5, y + 5))
 
 
@@ -62,72 +68,249 @@ def draw_add_bone_menu(surface, new_bone_data, selected_input_field, font):
     draw_button(surface, (320, 350, 100, 30), "Back", font)
 
 
-def draw_image_menu(surface, image_buttons, font, title="Select Image"):
+def draw_image_menu(surface, image_picker, font, title="Select Image"):
     pygame.draw.rect(surface, (50, 50, 50), (180, 150, 440, 300))
     pygame.draw.rect(surface, (255, 255, 255), (180, 150, 440, 300), 3)
-    txt = font.render(title, True, (255, 255, 255))
+    txt = render_text(font, title, (255, 255, 255))
     surface.blit(txt, (200, 160))
-    for thumb, _, (x, y), _ in image_buttons:
-        surface.blit(thumb, (x, y))
+    image_picker.draw(surface, font)
     draw_button(surface, (200, 420, 100, 30), "Back", font)
 
 
 
-def draw_sidebar(surface, bones, selected_bone, font, sidebar_width=200, screen_width=800, y_offset=0):
-    x = screen_width - sidebar_width
-    pygame.draw.rect(surface, (20, 20, 20), (x, y_offset, sidebar_width, surface.get_height() - y_offset))
+SIDEBAR_BG_COLOR = (20, 20, 20)
+SIDEBAR_ROW_HEIGHT = 30
+SIDEBAR_BUTTON_HEIGHT = 25
+SIDEBAR_INDENT = 12
+SIDEBAR_MAX_INDENT = 8  # depth levels before indentation stops growing
 
-    add_bone_rect = pygame.Rect(x + 10, y_offset + 10, sidebar_width - 20, 25)
-    color = BTN_COLOR if selected_bone is None else BTN_ACTIVE_COLOR
-    pygame.draw.rect(surface, color, add_bone_rect)
-    pygame.draw.rect(surface, TEXT_COLOR, add_bone_rect, 1)
-    txt = font.render("+ Add Bone", True, TEXT_COLOR)
-    surface.blit(txt, (add_bone_rect.x + 5, add_bone_rect.y + 5))
 
-    for i, bone in enumerate(bones):
-        y = y_offset + 40 + i * 30
-        rect = pygame.Rect(x + 10, y, sidebar_width - 20, 25)
-        color = BTN_COLOR if bone == selected_bone else BTN_ACTIVE_COLOR
-        pygame.draw.rect(surface, color, rect)
-        pygame.draw.rect(surface, TEXT_COLOR, rect, 1)
-        txt = font.render(bone.name, True, TEXT_COLOR)
-        surface.blit(txt, (rect.x + 5, rect.y + 5))
+class BoneList:
+    """
+    Virtualized, scrollable bone list for the sidebar.
 
+    Rows are fixed height, so only the rows inside the visible window are
+    drawn and a click maps straight to a row index from its y coordinate.
+    In tree view bones are listed depth-first under their parents and
+    indented by depth; otherwise they keep the order of the bones list.
 
-def draw_timeline(surface, bones, current_time, max_time, fps, frame_width, timeline_y, font, y_offset=0):
-    timeline_y += y_offset
-    pygame.draw.rect(surface, (20, 20, 20), (0, timeline_y, surface.get_width(), surface.get_height() - timeline_y))
-    pygame.draw.line(surface, (100, 100, 100), (0, timeline_y), (surface.get_width(), timeline_y), 2)
+    The rows are built once and reused until invalidate() is called, which
+    the owner does when bones are added, removed or reparented.
+    """
 
-    total_frames = int(max_time * fps)
-    for f in range(total_frames):
-        x = f * frame_width
-        if x >= surface.get_width():
-            break
-        color = (60, 60, 60) if f % fps != 0 else (100, 100, 100)
-        pygame.draw.line(surface, color, (x, timeline_y), (x, timeline_y + 10))
+    def __init__(self, rect, tree_view=False):
+        """
+        rect: the sidebar area, from just below the top bar down to where
+        the timeline starts.
+        """
+        self.rect = pygame.Rect(rect)
+        self.add_button_rect = pygame.Rect(self.rect.x + 10, self.rect.y + 10, self.rect.width - 20, SIDEBAR_BUTTON_HEIGHT)
+        self.list_rect = pygame.Rect(self.rect.x, self.rect.y + 40, self.rect.width, self.rect.height - 40)
+        self.tree_view = tree_view
+        self.scroll = 0  # pixels
+        self._rows = []  # (bone, depth)
+        self._rows_stale = True
+
+    def invalidate(self):
+        """The bones list or hierarchy changed; rebuild the rows on next use."""
+        self._rows_stale = True
+
+    def _sync_rows(self, bones):
+        if not self._rows_stale:
+            return
+        self._rows_stale = False
+        if not self.tree_view:
+            self._rows = [(bone, 0) for bone in bones]
+        else:
+            present = set(bones)
+            rows = []
+            # Bones whose parent is gone from the list show up as roots.
+            stack = [(b, 0) for b in reversed(bones) if b.parent is None or b.parent not in present]
+            while stack:
+                bone, depth = stack.pop()
+                rows.append((bone, depth))
+                stack.extend((c, depth + 1) for c in reversed(bone.children) if c in present)
+            self._rows = rows
+        self._clamp_scroll()
+
+    def _clamp_scroll(self):
+        content = len(self._rows) * SIDEBAR_ROW_HEIGHT
+        self.scroll = max(0, min(self.scroll, content - self.list_rect.height))
+
+    def scroll_by(self, rows):
+        self.scroll += rows * SIDEBAR_ROW_HEIGHT
+        self._clamp_scroll()
+
+    def toggle_tree_view(self):
+        self.tree_view = not self.tree_view
+        self._rows_stale = True
 
-    for idx, bone in enumerate(bones):
-        y_offset_bone = timeline_y + 20 + idx * 15
-        for key in bone.timeline.keyframes:
-            x = int(key.time * fps * frame_width)
-            if x < surface.get_width():
-                pygame.draw.circle(surface, (255, 0, 0), (x, y_offset_bone), 4)
+    def handle_event(self, event):
+        """Scroll on mouse wheel over the list. Returns True if the event was used."""
+        if event.type == pygame.MOUSEWHEEL and self.list_rect.collidepoint(pygame.mouse.get_pos()):
+            self.scroll_by(-event.y)
+            return True
+        return False
+
+    def row_at(self, pos, bones):
+        """Bone whose row button is under `pos`, or None."""
+        self._sync_rows(bones)
+        x, y = pos
+        if not self.list_rect.collidepoint(x, y):
+            return None
+        offset = y - self.list_rect.y + self.scroll
+        index, within = divmod(offset, SIDEBAR_ROW_HEIGHT)
+        if within >= SIDEBAR_BUTTON_HEIGHT or index >= len(self._rows):
+            return None
+        bone, depth = self._rows[index]
+        if self._row_rect(index, depth).collidepoint(x, y):
+            return bone
+        return None
 
-    time_x = int(current_time * fps * frame_width)
-    pygame.draw.line(surface, (0, 255, 255), (time_x, timeline_y), (time_x, surface.get_height()), 2)
+    def _row_rect(self, index, depth):
+        indent = min(depth, SIDEBAR_MAX_INDENT) * SIDEBAR_INDENT
+        y = self.list_rect.y + index * SIDEBAR_ROW_HEIGHT - self.scroll
+        return pygame.Rect(self.rect.x + 10 + indent, y, self.rect.width - 20 - indent, SIDEBAR_BUTTON_HEIGHT)
+
+    def draw(self, surface, bones, selected_bone, font):
+        self._sync_rows(bones)
+        pygame.draw.rect(surface, SIDEBAR_BG_COLOR, self.rect)
+
+        color = BTN_COLOR if selected_bone is None else BTN_ACTIVE_COLOR
+        pygame.draw.rect(surface, color, self.add_button_rect)
+        pygame.draw.rect(surface, TEXT_COLOR, self.add_button_rect, 1)
+        txt = render_text(font, "+ Add Bone", TEXT_COLOR)
+        surface.blit(txt, (self.add_button_rect.x + 5, self.add_button_rect.y + 5))
+
+        first = self.scroll // SIDEBAR_ROW_HEIGHT
+        last = min(len(self._rows), (self.scroll + self.list_rect.height) // SIDEBAR_ROW_HEIGHT + 1)
+        previous_clip = surface.get_clip()
+        surface.set_clip(self.list_rect.clip(previous_clip))
+        for index in range(first, last):
+            bone, depth = self._rows[index]
+            rect = self._row_rect(index, depth)
+            color = BTN_COLOR if bone == selected_bone else BTN_ACTIVE_COLOR
+            pygame.draw.rect(surface, color, rect)
+            pygame.draw.rect(surface, TEXT_COLOR, rect, 1)
+            txt = render_text(font, bone.name, TEXT_COLOR)
+            surface.blit(txt, (rect.x + 5, rect.y + 5))
 
+        content = len(self._rows) * SIDEBAR_ROW_HEIGHT
+        if content > self.list_rect.height:
+            track = self.list_rect.height
+            thumb = max(20, track * track // content)
+            thumb_y = self.list_rect.y + (track - thumb) * self.scroll // (content - track)
+            pygame.draw.rect(surface, (90, 90, 90), (self.rect.right - 6, thumb_y, 4, thumb))
+        surface.set_clip(previous_clip)
 
-def draw_play_button(surface, play_mode, font, screen_width=800, screen_height=600, y_offset=0):
+
+TIMELINE_BG_COLOR = (20, 20, 20)
+KEYFRAME_COLOR = (255, 0, 0)
+KEYFRAME_RADIUS = 4
+TIMELINE_ROW_TOP = 20
+TIMELINE_ROW_HEIGHT = 15
+
+
+class TimelineStrip:
+    """
+    Timeline drawing with a cached background.
+
+    Ticks and keyframe markers are pre-rendered onto an offscreen surface;
+    each frame only blits it and draws the playhead. The whole background is
+    rebuilt when the layout changes (size, FPS, zoom, max time or the bone
+    list); when a track is edited only that bone's marker row is redrawn.
+    Markers are found with a range lookup over the sorted key times limited
+    to the visible time window, and collapsed to one per pixel column.
+
+    Callers that keep edit counters can pass version=(bones version, keys
+    version); while it is unchanged, drawing skips every per-bone check and
+    only blits the background and the playhead.
+    """
+
+    def __init__(self):
+        self._background = None
+        self._layout = None
+        self._row_versions = {}
+        self._version = None
+
+    def draw(self, surface, bones, current_time, max_time, fps, frame_width, timeline_y, y_offset=0, version=None):
+        timeline_y += y_offset
+        width, height = surface.get_width(), surface.get_height() - timeline_y
+        if version is None:
+            bones_key = tuple(id(b.timeline) for b in bones)
+        else:
+            bones_key = version[0]
+        layout = (width, height, max_time, fps, frame_width, bones_key)
+        if layout != self._layout or self._background is None:
+            self._build_background(surface, width, height, max_time, fps, frame_width)
+            self._layout = layout
+            self._row_versions = {}
+            self._version = None
+
+        if version is None or version != self._version:
+            for idx, bone in enumerate(bones):
+                row_version = bone.timeline.version
+                if self._row_versions.get(idx) != row_version:
+                    self._draw_row(idx, bone.timeline, fps, frame_width)
+                    self._row_versions[idx] = row_version
+            self._version = version
+
+        surface.blit(self._background, (0, timeline_y))
+        time_x = int(current_time * fps * frame_width)
+        pygame.draw.line(surface, (0, 255, 255), (time_x, timeline_y), (time_x, surface.get_height()), 2)
+
+    def _build_background(self, surface, width, height, max_time, fps, frame_width):
+        background = pygame.Surface((width, height), 0, surface)
+        background.fill(TIMELINE_BG_COLOR)
+        pygame.draw.line(background, (100, 100, 100), (0, 0), (width, 0), 2)
+
+        total_frames = int(max_time * fps)
+        for f in range(total_frames):
+            x = f * frame_width
+            if x >= width:
+                break
+            color = (60, 60, 60) if f % fps != 0 else (100, 100, 100)
+            pygame.draw.line(background, color, (x, 0), (x, 10))
+        self._background = background
+
+    def _draw_row(self, idx, timeline, fps, frame_width):
+        background = self._background
+        width = background.get_width()
+        row_y = TIMELINE_ROW_TOP + idx * TIMELINE_ROW_HEIGHT
+        background.fill(TIMELINE_BG_COLOR, (0, row_y - KEYFRAME_RADIUS, width, 2 * KEYFRAME_RADIUS + 1))
+
+        scale = fps * frame_width
+        if not len(timeline.times) or scale <= 0:
+            return
+        # Keys at or past this time land at x >= width and are never drawn.
+        visible = bisect_left(timeline.times, width / scale)
+        times = np.frombuffer(timeline.times, dtype=np.float64)[:visible + 1]
+        xs = (times * scale).astype(np.int64)
+        for x in np.unique(xs[xs < width]).tolist():
+            pygame.draw.circle(background, KEYFRAME_COLOR, (x, row_y), KEYFRAME_RADIUS)
+
+
+_timeline_strip = TimelineStrip()
+
+
+def draw_timeline(surface, bones, current_time, max_time, fps, frame_width, timeline_y, font, y_offset=0, version=None):
+    _timeline_strip.draw(surface, bones, current_time, max_time, fps, frame_width, timeline_y, y_offset, version)
+
+
+def play_button_rect(screen_width=800, screen_height=600):
     button_width, button_height = 100, 30
     x = (screen_width - button_width) // 2
     y = screen_height - button_height
-    rect = pygame.Rect(x, y, button_width, button_height)
+    return pygame.Rect(x, y, button_width, button_height)
+
+
+def draw_play_button(surface, play_mode, font, screen_width=800, screen_height=600, y_offset=0):
+    rect = play_button_rect(screen_width, screen_height)
     color = (100, 255, 100) if play_mode else (100, 100, 255)
     pygame.draw.rect(surface, color, rect)
     pygame.draw.rect(surface, (255, 255, 255), rect, 2)
     text = "Stop" if play_mode else "Play"
-    txt_surface = font.render(text, True, (255, 255, 255))
+    txt_surface = render_text(font, text, (255, 255, 255))
     txt_rect = txt_surface.get_rect(center=rect.center)
     surface.blit(txt_surface, txt_rect)
     return rect
@@ -216,6 +399,11 @@ class ContextMenu:
                     break
         return None
 
+    def get_rect(self):
+        """Area the menu covers when visible."""
+        x, y = self.position
+        return pygame.Rect(x, y, CONTEXT_MENU_WIDTH, CONTEXT_MENU_OPTION_HEIGHT * len(self.options))
+
     def draw(self, surface):
         if not self.visible:
             return
@@ -226,7 +414,7 @@ class ContextMenu:
             color = BG_COLOR if i != self.selected_index else (80, 80, 80)
             pygame.draw.rect(surface, color, rect)
             pygame.draw.rect(surface, TEXT_COLOR, rect, 1)
-            txt_surf = pygame.font.SysFont(None, 20).render(label, True, TEXT_COLOR)
+            txt_surf = render_text(get_font(None, 20), label, TEXT_COLOR)
             surface.blit(txt_surf, (x + 5, y + i * CONTEXT_MENU_OPTION_HEIGHT + 5))
 
 
@@ -284,12 +472,25 @@ class TopBar:
                         return items[item_index][1]
         return None
 
+    def get_rect(self, surface_width):
+        """Area the bar covers, including the open dropdown if any."""
+        rect = pygame.Rect(0, 0, surface_width, TOPBAR_HEIGHT)
+        if self.active_menu:
+            menu_index = list(self.menus.keys()).index(self.active_menu)
+            rect.union_ip(pygame.Rect(
+                menu_index * TOPBAR_MENU_WIDTH,
+                TOPBAR_HEIGHT,
+                TOPBAR_MENU_WIDTH,
+                TOPBAR_DROPDOWN_HEIGHT * len(self.menus[self.active_menu]),
+            ))
+        return rect
+
     def draw(self, surface):
         pygame.draw.rect(surface, BG_COLOR, (0, 0, surface.get_width(), TOPBAR_HEIGHT))
         for i, menu_name in enumerate(self.menus.keys()):
             rect = pygame.Rect(i * TOPBAR_MENU_WIDTH, 0, TOPBAR_MENU_WIDTH, TOPBAR_HEIGHT)
             pygame.draw.rect(surface, BTN_ACTIVE_COLOR if self.active_menu == menu_name else BTN_COLOR, rect)
-            txt_surf = pygame.font.SysFont(None, 20).render(menu_name, True, TEXT_COLOR)
+            txt_surf = render_text(get_font(None, 20), menu_name, TEXT_COLOR)
             txt_rect = txt_surf.get_rect(center=rect.center)
             surface.blit(txt_surf, txt_rect)
 
@@ -301,7 +502,7 @@ class TopBar:
             for i, (label, _) in enumerate(items):
                 rect = pygame.Rect(x, y + i * TOPBAR_DROPDOWN_HEIGHT, TOPBAR_MENU_WIDTH, TOPBAR_DROPDOWN_HEIGHT)
                 pygame.draw.rect(surface, BTN_ACTIVE_COLOR, rect)
-                txt_surf = pygame.font.SysFont(None, 18).render(label, True, TEXT_COLOR)
+                txt_surf = render_text(get_font(None, 18), label, TEXT_COLOR)
                 surface.blit(txt_surf, (x + 5, y + i * TOPBAR_DROPDOWN_HEIGHT + 5))
 
 
@@ -381,30 +582,79 @@ def handle_text_input(event, selected_input_field, data_dict):
 
 
 
-def load_image_buttons(assets_folder):
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".gif")
+PICKER_ORIGIN = (200, 180)
+PICKER_COLUMNS = 5
+PICKER_ROWS = 3
+PICKER_PADDING = 10
+PLACEHOLDER_COLOR = (70, 70, 70)
+
+
+class ImagePicker:
     """
-    Load images from assets_folder and create thumbnail buttons.
-    Returns a list of tuples: (thumbnail_surface, image_path, (x, y), rect)
+    Paged grid of image thumbnails for the choose-image menu.
+
+    Only the paths are listed up front; thumbnails come from a
+    thumbnails.ThumbnailCache and are asked for only for the page being
+    drawn, with a placeholder square until each one is ready.
     """
-    image_buttons = []
-    x_start, y_start = 200, 180
-    padding = 10
-    thumb_size = (64, 64)
-    x, y = x_start, y_start
-
-    for filename in os.listdir(assets_folder):
-        if filename.lower().endswith((".png", ".jpg", ".jpeg", ".bmp", ".gif")):
-            full_path = os.path.join(assets_folder, filename)
-            try:
-                img = pygame.image.load(full_path).convert_alpha()
-                img_thumb = pygame.transform.smoothscale(img, thumb_size)
-                rect = pygame.Rect(x, y, *thumb_size)
-                image_buttons.append((img_thumb, full_path, (x, y), rect))
-                x += thumb_size[0] + padding
-                # wrap to next line if needed (e.g. 5 per row)
-                if (x - x_start) // (thumb_size[0] + padding) >= 5:
-                    x = x_start
-                    y += thumb_size[1] + padding
-            except Exception as e:
-                print(f"Failed to load image {filename}: {e}")
-    return image_buttons
+
+    def __init__(self, assets_folder, thumbnails):
+        self.thumbnails = thumbnails
+        self.paths = sorted(
+            os.path.join(assets_folder, filename)
+            for filename in os.listdir(assets_folder)
+            if filename.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        self.page = 0
+        w, h = thumbnails.size
+        self.prev_rect = pygame.Rect(320, 420, 60, 30)
+        self.next_rect = pygame.Rect(390, 420, 60, 30)
+        self._cells = [
+            pygame.Rect(PICKER_ORIGIN[0] + col * (w + PICKER_PADDING), PICKER_ORIGIN[1] + row * (h + PICKER_PADDING), w, h)
+            for row in range(PICKER_ROWS)
+            for col in range(PICKER_COLUMNS)
+        ]
+
+    @property
+    def page_count(self):
+        return max(1, -(-len(self.paths) // len(self._cells)))
+
+    def visible(self):
+        """(path, rect) for each image on the current page."""
+        first = self.page * len(self._cells)
+        return list(zip(self.paths[first:first + len(self._cells)], self._cells))
+
+    def draw(self, surface, font):
+        # Drawn last-to-first: the thumbnail worker makes the newest request
+        # first, so the top-left thumbnail is ready first.
+        for path, rect in reversed(self.visible()):
+            thumb = self.thumbnails.get(path)
+            if thumb is None:
+                pygame.draw.rect(surface, PLACEHOLDER_COLOR, rect)
+            else:
+                surface.blit(thumb, rect)
+        if self.page_count > 1:
+            draw_button(surface, self.prev_rect, "<", font, active=self.page == 0)
+            draw_button(surface, self.next_rect, ">", font, active=self.page == self.page_count - 1)
+            label = render_text(font, f"{self.page + 1}/{self.page_count}", TEXT_COLOR)
+            surface.blit(label, (self.next_rect.right + 10, self.next_rect.y + 5))
+
+    def handle_click(self, pos):
+        """Turn the page or return the clicked image's path (None otherwise)."""
+        if self.page_count > 1:
+            if self.prev_rect.collidepoint(pos):
+                self.page = max(0, self.page - 1)
+                return None
+            if self.next_rect.collidepoint(pos):
+                self.page = min(self.page_count - 1, self.page + 1)
+                return None
+        for path, rect in self.visible():
+            if rect.collidepoint(pos):
+                return path
+        return None
+
+    def handle_event(self, event):
+        """Mouse wheel turns pages."""
+        if event.type == pygame.MOUSEWHEEL:
+            self.page = min(max(0, self.page - event.y), self.page_count - 1)
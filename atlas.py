@@ -0,0 +1,177 @@
+import json
+import os
+
+import pygame
+
+import settings
+
+# Saved atlas layout, next to the project file:
+#   <project>.atlas.json     index: page files and, per source path, the page,
+#                            rect and the source file's mtime/size when packed
+#   <project>.atlas.<n>.png  page images
+_INDEX_SUFFIX = ".atlas.json"
+
+
+def atlas_path(project_filename):
+    """Index file of the atlas saved alongside `project_filename`."""
+    return os.path.splitext(project_filename)[0] + _INDEX_SUFFIX
+
+
+class TextureAtlas:
+    """
+    Bone sprites packed into a few large page surfaces.
+
+    Each source path is stored once; get() hands out a subsurface of its
+    page, so every bone using the same sprite shares one block of pixels
+    (and one set of entries in the rotation cache). Pages are filled with a
+    simple shelf packer: sprites go left to right along the current shelf,
+    a new shelf starts below when a row is full and a new page when the page
+    is. Sprites larger than a page get a page of their own.
+    """
+
+    def __init__(self, page_size=settings.ATLAS_PAGE_SIZE):
+        self.page_size = page_size
+        self.pages = []
+        self._regions = {}  # path -> (page index, Rect)
+        self._images = {}  # path -> subsurface handle
+        # Shelf state of the page currently being filled (the last one).
+        self._open_page = None
+        self._shelf_x = self._shelf_y = self._shelf_height = 0
+
+    def __contains__(self, path):
+        return path in self._regions
+
+    def __len__(self):
+        return len(self._regions)
+
+    def get(self, path):
+        """Subsurface for the image at `path`, loading and packing it on first use."""
+        if path not in self._images:
+            self.add(path, pygame.image.load(path))
+        return self._images[path]
+
+    def add(self, path, surface):
+        """Pack `surface` as the image for `path` and return its subsurface."""
+        if path in self._images:
+            return self._images[path]
+        if pygame.display.get_init() and pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        page, rect = self._allocate(*surface.get_size())
+        # The area is still fully transparent, so a MAX blend copies the
+        # pixels exactly; a normal alpha blit would darken soft edges.
+        self.pages[page].blit(surface, rect, special_flags=pygame.BLEND_RGBA_MAX)
+        return self._store(path, page, rect)
+
+    def images_for(self, paths, workers=None):
+        """
+        {path: subsurface} for every path in `paths` that can be loaded.
+        Paths not in the atlas yet are decoded in parallel, then packed
+        tallest first, which keeps shelves tight.
+        """
+        import saving
+
+        paths = list(dict.fromkeys(paths))
+        decoded = saving.decode_images((p for p in paths if p not in self._images), workers)
+        for path, surface in sorted(decoded.items(), key=lambda item: -item[1].get_height()):
+            self.add(path, surface)
+        return {path: self._images[path] for path in paths if path in self._images}
+
+    def save(self, index_filename, paths=None):
+        """
+        Write the atlas (restricted to `paths` if given) as PNG pages plus a
+        JSON index. The sprites are repacked into fresh pages first so images
+        no longer in use aren't saved.
+        """
+        paths = [p for p in (self._regions if paths is None else dict.fromkeys(paths)) if p in self._images]
+        packed = TextureAtlas(self.page_size)
+        for path in sorted(paths, key=lambda p: -self._regions[p][1].height):
+            packed.add(path, self._images[path])
+
+        base = index_filename[:-len(_INDEX_SUFFIX)] if index_filename.endswith(_INDEX_SUFFIX) else index_filename
+        page_files = []
+        for i, page in enumerate(packed.pages):
+            page_file = f"{base}.atlas.{i}.png"
+            pygame.image.save(page, page_file)
+            page_files.append(os.path.basename(page_file))
+
+        entries = {}
+        for path, (page, rect) in packed._regions.items():
+            entry = {"page": page, "rect": list(rect)}
+            if os.path.isfile(path):
+                stat = os.stat(path)
+                entry["mtime"] = stat.st_mtime
+                entry["size"] = stat.st_size
+            entries[path] = entry
+        with open(index_filename, "w") as f:
+            json.dump({"pages": page_files, "images": entries}, f, indent=4)
+
+    def load(self, index_filename):
+        """
+        Add the sprites of a saved atlas, one image load per page. Entries
+        whose source file changed since the atlas was saved are skipped so
+        they get decoded afresh. Returns the number of sprites added.
+        """
+        if not os.path.isfile(index_filename):
+            return 0
+        try:
+            with open(index_filename, "r") as f:
+                index = json.load(f)
+            folder = os.path.dirname(index_filename)
+            pages = [pygame.image.load(os.path.join(folder, name)) for name in index["pages"]]
+        except Exception as e:
+            print(f"[ATLAS ERROR] Failed to load atlas {index_filename}: {e}")
+            return 0
+
+        if pygame.display.get_init() and pygame.display.get_surface() is not None:
+            pages = [page.convert_alpha() for page in pages]
+        first = len(self.pages)
+        self.pages.extend(pages)
+        # Loaded pages are never packed into further.
+        self._open_page = None
+
+        added = 0
+        for path, entry in index["images"].items():
+            if path in self._images or _source_changed(path, entry):
+                continue
+            self._store(path, first + entry["page"], pygame.Rect(entry["rect"]))
+            added += 1
+        return added
+
+    def _store(self, path, page, rect):
+        self._regions[path] = (page, rect)
+        self._images[path] = self.pages[page].subsurface(rect)
+        return self._images[path]
+
+    def _allocate(self, width, height):
+        size = self.page_size
+        if width > size or height > size:
+            self.pages.append(_new_page(width, height))
+            return len(self.pages) - 1, pygame.Rect(0, 0, width, height)
+
+        if self._open_page is not None and self._shelf_x + width > size:
+            self._shelf_x = 0
+            self._shelf_y += self._shelf_height
+            self._shelf_height = 0
+        if self._open_page is None or self._shelf_y + height > size:
+            self.pages.append(_new_page(size, size))
+            self._open_page = len(self.pages) - 1
+            self._shelf_x = self._shelf_y = self._shelf_height = 0
+
+        rect = pygame.Rect(self._shelf_x, self._shelf_y, width, height)
+        self._shelf_x += width
+        self._shelf_height = max(self._shelf_height, height)
+        return self._open_page, rect
+
+
+def _new_page(width, height):
+    page = pygame.Surface((width, height), pygame.SRCALPHA)
+    if pygame.display.get_init() and pygame.display.get_surface() is not None:
+        page = page.convert_alpha()
+    page.fill((0, 0, 0, 0))
+    return page
+
+def _source_changed(path, entry):
+    if not os.path.isfile(path):
+        return False  # the atlas holds the only copy left
+    stat = os.stat(path)
+    return stat.st_mtime != entry.get("mtime") or stat.st_size != entry.get("size")
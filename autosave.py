@@ -0,0 +1,314 @@
+import json
+import os
+import queue
+import threading
+import time
+
+import saving
+import settings
+from timeline import Timeline
+
+# Autosave folder layout:
+#   journal.jsonl        append-only edit log, one JSON object per line. The
+#                        first line names the snapshot it applies on top of
+#                        and maps that snapshot's bone order to bone ids.
+#   snapshot-<n>.sprb    full project snapshots (binary saving format)
+#
+# Compaction writes snapshot n+1 (temp file, fsync, rename), then atomically
+# swaps in a fresh journal that points at it, then deletes snapshot n. A
+# crash at any point leaves a journal whose base snapshot is complete and on
+# disk. Journal appends are fsynced after every batch of edits.
+JOURNAL_NAME = "journal.jsonl"
+_SNAPSHOT_PREFIX = "snapshot-"
+
+
+class Autosave:
+    """
+    Background autosave for the editor.
+
+    The record methods (add_bone, delete_bone, add_keyframe, set_angle,
+    set_position) only copy a few values onto a queue, so they never block
+    the render loop. A worker thread appends the edits to the journal,
+    applies them to its own copy of the project and, every `interval`
+    seconds, compacts that copy into a new snapshot. The worker never reads
+    the editor's bones.
+    """
+
+    def __init__(self, folder=None, interval=None):
+        self.folder = folder or settings.AUTOSAVE_FOLDER
+        self.interval = settings.AUTOSAVE_INTERVAL if interval is None else interval
+        self._ids = {}
+        self._next_id = 0
+        self._queue = queue.Queue()
+        self._thread = None
+
+    # --- Recording (editor thread) ---
+
+    def start(self, bones):
+        """Take `bones` as the current project and start the worker."""
+        self.reset(bones)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+            self._thread.start()
+
+    def reset(self, bones):
+        """Replace the whole project, e.g. after loading a file."""
+        self._ids = {}
+        ids = [self._bone_id(bone) for bone in bones]
+        records = saving.records_from_bones(bones)
+        for record in records:
+            timeline = record["timeline"]
+            record["timeline"] = (timeline.times[:], timeline.angles[:])
+        self._queue.put(("reset", ids, records))
+
+    def add_bone(self, bone):
+        self._record(
+            "add_bone",
+            id=self._bone_id(bone),
+            name=bone.name,
+            length=bone.length,
+            angle=bone.angle,
+            x=bone.x,
+            y=bone.y,
+            parent=self._ids.get(bone.parent),
+            image_path=bone.image_path,
+        )
+
+    def delete_bone(self, bone):
+        bone_id = self._ids.pop(bone, None)
+        if bone_id is not None:
+            self._record("delete_bone", id=bone_id)
+
+    def add_keyframe(self, bone, time, angle):
+        self._record("add_keyframe", id=self._ids.get(bone), time=time, angle=angle)
+
+    def set_angle(self, bone):
+        self._record("set_angle", id=self._ids.get(bone), angle=bone.angle)
+
+    def set_position(self, bone):
+        self._record("set_position", id=self._ids.get(bone), x=bone.x, y=bone.y)
+
+    def stop(self):
+        """Flush pending edits, write a final snapshot and stop the worker."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _bone_id(self, bone):
+        if bone not in self._ids:
+            self._ids[bone] = self._next_id
+            self._next_id += 1
+        return self._ids[bone]
+
+    def _record(self, op, **fields):
+        if fields.get("id") is not None:
+            self._queue.put(("edit", dict(op=op, **fields)))
+
+    # --- Worker thread ---
+
+    def _run(self):
+        os.makedirs(self.folder, exist_ok=True)
+        project = _Project(Timeline)
+        generation = _latest_generation(self.folder)
+        journal = None
+        pending = False
+        compact_now = False
+        last_compact = time.monotonic()
+        stopping = False
+
+        while not stopping:
+            # With nothing waiting to be compacted, sleep until the next edit.
+            if compact_now:
+                timeout = 0.0
+            elif pending:
+                timeout = max(0.0, last_compact + self.interval - time.monotonic())
+            else:
+                timeout = None
+            try:
+                items = [self._queue.get(timeout=timeout)]
+            except queue.Empty:
+                items = []
+            # Drain whatever else is waiting so a burst of edits (e.g. a drag)
+            # becomes one write.
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            lines = []
+            for item in items:
+                if item is None:
+                    stopping = True
+                elif item[0] == "reset":
+                    project.reset(item[1], item[2])
+                    lines = []
+                    pending = True
+                    compact_now = True  # snapshot a new project right away
+                else:
+                    project.apply(item[1])
+                    lines.append(json.dumps(item[1]))
+                    pending = True
+
+            if pending and (stopping or compact_now or time.monotonic() - last_compact >= self.interval):
+                if journal is not None:
+                    journal.close()
+                generation += 1
+                journal = _compact(self.folder, generation, project)
+                last_compact = time.monotonic()
+                pending = compact_now = False
+            elif lines and journal is not None:
+                journal.write("\n".join(lines) + "\n")
+                journal.flush()
+                os.fsync(journal.fileno())
+
+        if journal is not None:
+            journal.close()
+
+
+class _Project:
+    """The worker's copy of the project: saving-style records keyed by bone id."""
+
+    def __init__(self, timeline_class):
+        self.timeline_class = timeline_class
+        self.records = {}
+
+    def reset(self, ids, records):
+        """Start over from saving-style records whose timelines are (times, angles) pairs."""
+        self.records = {}
+        for bone_id, record in zip(ids, records):
+            record = dict(record)
+            record["parent"] = None if record["parent"] is None else ids[record["parent"]]
+            record["timeline"] = self.timeline_class.from_arrays(*record["timeline"])
+            self.records[bone_id] = record
+
+    def apply(self, edit):
+        op = edit["op"]
+        if op == "add_bone":
+            record = {key: edit[key] for key in ("name", "length", "angle", "x", "y", "parent", "image_path")}
+            record["timeline"] = self.timeline_class()
+            self.records[edit["id"]] = record
+            return
+        record = self.records.get(edit["id"])
+        if record is None:
+            return
+        if op == "delete_bone":
+            del self.records[edit["id"]]
+            for other in self.records.values():
+                if other["parent"] == edit["id"]:
+                    other["parent"] = None
+        elif op == "add_keyframe":
+            record["timeline"].add_keyframe(edit["time"], edit["angle"])
+        elif op == "set_angle":
+            record["angle"] = edit["angle"]
+        elif op == "set_position":
+            record["x"] = edit["x"]
+            record["y"] = edit["y"]
+
+    def to_records(self):
+        """Saving-format records (parents as list indices) and their bone ids."""
+        ids = list(self.records)
+        index = {bone_id: i for i, bone_id in enumerate(ids)}
+        records = []
+        for bone_id in ids:
+            record = dict(self.records[bone_id])
+            record["parent"] = index.get(record["parent"])
+            records.append(record)
+        return ids, records
+
+
+def _snapshot_name(generation):
+    return f"{_SNAPSHOT_PREFIX}{generation}{saving.BINARY_EXTENSION}"
+
+def _latest_generation(folder):
+    generations = [0]
+    for name in os.listdir(folder):
+        if name.startswith(_SNAPSHOT_PREFIX) and name.endswith(saving.BINARY_EXTENSION):
+            number = name[len(_SNAPSHOT_PREFIX):-len(saving.BINARY_EXTENSION)]
+            if number.isdigit():
+                generations.append(int(number))
+    return max(generations)
+
+def _replace_atomically(path, write):
+    # The temp name keeps the extension, which saving uses to pick the format.
+    root, extension = os.path.splitext(path)
+    temp = root + ".tmp" + extension
+    write(temp)
+    with open(temp, "r+b") as f:
+        os.fsync(f.fileno())
+    os.replace(temp, path)
+    _fsync_folder(os.path.dirname(path))
+
+def _fsync_folder(folder):
+    """Make a rename in `folder` durable (POSIX only; Windows can't open folders)."""
+    if os.name != "posix":
+        return
+    fd = os.open(folder or ".", os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def _compact(folder, generation, project):
+    """Write a snapshot of `project`, start a fresh journal on it and return the journal."""
+    ids, records = project.to_records()
+    snapshot = _snapshot_name(generation)
+    _replace_atomically(os.path.join(folder, snapshot), lambda path: saving.write_records(records, path))
+
+    journal_path = os.path.join(folder, JOURNAL_NAME)
+    header = json.dumps({"op": "base", "snapshot": snapshot, "ids": ids})
+
+    def write_journal(path):
+        with open(path, "w") as f:
+            f.write(header + "\n")
+
+    _replace_atomically(journal_path, write_journal)
+
+    for name in os.listdir(folder):
+        if name.startswith(_SNAPSHOT_PREFIX) and name != snapshot:
+            os.remove(os.path.join(folder, name))
+    return open(journal_path, "a")
+
+
+def recover(bone_class, timeline_class, folder=None, atlas=None):
+    """
+    Rebuild the last autosaved project: load the journal's base snapshot and
+    replay the journal on top of it. Bone images are packed into `atlas` if
+    given. Returns a list of bones (empty if there is nothing to recover).
+    """
+    folder = folder or settings.AUTOSAVE_FOLDER
+    journal_path = os.path.join(folder, JOURNAL_NAME)
+    if not os.path.isfile(journal_path):
+        return []
+
+    try:
+        with open(journal_path, "r") as f:
+            lines = f.read().splitlines()
+        header = json.loads(lines[0])
+        records = saving.read_records(os.path.join(folder, header["snapshot"]), timeline_class)
+    except Exception as e:
+        print(f"[AUTOSAVE ERROR] Failed to recover project: {e}")
+        return []
+
+    project = _Project(timeline_class)
+    ids = header["ids"]
+    for record in records:
+        timeline = record["timeline"]
+        record["timeline"] = (timeline.times, timeline.angles)
+    project.reset(ids, records)
+    replayed = 0
+    for line in lines[1:]:
+        try:
+            edit = json.loads(line)
+        except ValueError:
+            break  # torn final write from a crash
+        project.apply(edit)
+        replayed += 1
+
+    records = project.to_records()[1]
+    paths = [r["image_path"] for r in records if r["image_path"]]
+    images = atlas.images_for(paths) if atlas is not None else saving.decode_images(paths)
+    bones = saving.build_bones(records, bone_class, images)
+    print(f"[AUTOSAVE] Recovered {len(bones)} bones ({replayed} journaled edits)")
+    return bones
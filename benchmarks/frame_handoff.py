@@ -0,0 +1,93 @@
+"""
+Compare the old and new ways of handing a rendered Surface to Pillow.
+
+    python -m benchmarks.frame_handoff [--frames N] [--size W H]
+
+old: pygame.image.tostring + Image.frombytes (a bytes copy, then a Pillow copy)
+new: export.surface_to_image (Pillow unpacks straight from the Surface buffer)
+
+Reports time per frame, Python-heap bytes allocated per frame (tracemalloc)
+and Pillow images created per frame; full-frame copies are the sum of the
+frame-sized Python buffers and the Pillow images.
+"""
+import argparse
+import json
+import os
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from PIL import Image
+
+import export
+
+
+def _old_handoff(surface):
+    raw = pygame.image.tostring(surface, "RGB")
+    return Image.frombytes("RGB", surface.get_size(), raw)
+
+
+def _new_handoff(surface):
+    return export.surface_to_image(surface)
+
+
+def measure(handoff, surface, frames):
+    frame_bytes = surface.get_width() * surface.get_height() * 3
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        handoff(surface)
+    seconds = (time.perf_counter() - start) / frames
+
+    images_before = Image.core.get_stats()["new_count"]
+    tracemalloc.start()
+    peak = 0
+    for _ in range(frames):
+        tracemalloc.reset_peak()
+        handoff(surface)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+    tracemalloc.stop()
+    images = (Image.core.get_stats()["new_count"] - images_before) / frames
+
+    return {
+        "ms_per_frame": seconds * 1000,
+        "python_bytes_per_frame": peak,
+        "pillow_images_per_frame": images,
+        "full_frame_copies": peak // frame_bytes + images,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--size", type=int, nargs=2, default=(800, 600), metavar=("W", "H"))
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    pygame.display.init()
+    surface = pygame.display.set_mode(tuple(args.size))
+    surface.fill((30, 30, 30))
+    pygame.draw.circle(surface, (255, 0, 0), (args.size[0] // 2, args.size[1] // 2), 50)
+
+    results = {
+        "old": measure(_old_handoff, surface, args.frames),
+        "new": measure(_new_handoff, surface, args.frames),
+    }
+    pygame.quit()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for name, r in results.items():
+        print(
+            f"{name}: {r['ms_per_frame']:.3f} ms/frame, "
+            f"{r['python_bytes_per_frame']} Python bytes/frame, "
+            f"{r['pillow_images_per_frame']:.0f} Pillow images/frame, "
+            f"{r['full_frame_copies']:.0f} full-frame copies"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Check that the multi-process PNG export matches the serial one, and time both.
+
+    python -m benchmarks.parallel_export [--frames N] [--workers W [W ...]]
+
+Builds a rig the way the editor leaves one: an unnamed root, two bones that
+share a name with children under each, and sprites loaded from image files.
+Exports it with export_animation_frames and with
+export_animation_frames_parallel for every worker count, compares every
+frame pixel for pixel and reports frames/s. Exits with status 1 if any
+frame differs.
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+import export
+import settings
+from bones import Bone
+from timeline import Timeline
+
+
+def make_rig(folder):
+    """Unnamed root, duplicate names and file-backed sprites."""
+    sprite_paths = []
+    for i, color in enumerate(((220, 80, 80, 255), (80, 200, 120, 180))):
+        sprite = pygame.Surface((18 + 10 * i, 30), pygame.SRCALPHA)
+        sprite.fill(color)
+        path = os.path.join(folder, f"sprite{i}.png")
+        pygame.image.save(sprite, path)
+        sprite_paths.append(path)
+
+    def bone(name, length, keys, parent=None, sprite=None):
+        timeline = Timeline.from_arrays([t for t, _ in keys], [a for _, a in keys])
+        path = sprite_paths[sprite] if sprite is not None else None
+        image = pygame.image.load(path) if path else None
+        return Bone(name, length, timeline, parent=parent, image=image, image_path=path)
+
+    root = bone("", 40, [(0.0, 0.0), (1.0, 90.0)])
+    root.x, root.y = settings.SCREEN_WIDTH // 2, settings.SCREEN_HEIGHT // 2
+    left = bone("x", 60, [(0.0, 30.0), (1.0, -60.0)], root, sprite=0)
+    right = bone("x", 50, [(0.0, -45.0), (1.0, 120.0)], root, sprite=1)
+    left_tip = bone("", 35, [(0.0, 10.0), (1.0, 80.0)], left, sprite=1)
+    right_tip = bone("tip", 45, [(0.0, 0.0), (1.0, -90.0)], right, sprite=0)
+    return [root, left, right, left_tip, right_tip]
+
+
+def _frames(folder):
+    return {name: pygame.image.tostring(pygame.image.load(os.path.join(folder, name)), "RGB")
+            for name in sorted(os.listdir(folder))}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--fps", type=int, default=20)
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4])
+    args = parser.parse_args(argv)
+
+    pygame.display.init()
+    pygame.font.init()
+    pygame.display.set_mode((1, 1))
+    size = (settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT)
+    mismatched = False
+    try:
+        with tempfile.TemporaryDirectory(prefix="sprote_parallel_") as folder:
+            bones = make_rig(folder)
+
+            serial_folder = os.path.join(folder, "serial")
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                export.export_animation_frames(bones, pygame.Surface(size), total_frames=args.frames,
+                                               fps=args.fps, output_folder=serial_folder)
+            print(f"serial     {args.frames / (time.perf_counter() - start):8.1f} frames/s")
+            expected = _frames(serial_folder)
+
+            for workers in args.workers:
+                out = os.path.join(folder, f"parallel{workers}")
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    export.export_animation_frames_parallel(bones, total_frames=args.frames, fps=args.fps,
+                                                            output_folder=out, workers=workers, size=size)
+                rate = args.frames / (time.perf_counter() - start)
+                actual = _frames(out)
+                differing = [name for name in expected if actual.get(name) != expected[name]]
+                if actual.keys() != expected.keys() or differing:
+                    mismatched = True
+                    status = f"MISMATCH ({len(differing)} of {len(expected)} frames differ)"
+                else:
+                    status = "identical"
+                print(f"{workers:>2} workers {rate:8.1f} frames/s  {status}")
+    finally:
+        pygame.quit()
+    return 1 if mismatched else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+"""
+Headless benchmarks for the timeline, pose and render hot paths.
+
+    python -m benchmarks.suite [--bones N] [--depth D] [--keys K] [--sprites S]
+                               [--json OUT] [--save-baseline FILE]
+                               [--baseline FILE] [--threshold FRACTION]
+
+Builds a synthetic rig (N bones in chains of up to D bones under one root,
+K keyframes per track, S distinct sprites shared round-robin) and measures:
+
+  timeline_sequential / timeline_random   Timeline.get_angle_at calls/s
+  bone_update                             ms per frame (angles + Bone.update)
+  bone_draw                               ms per frame (Bone.draw, 800x600)
+  export                                  PNG export frames/s
+  save_json / load_json / save_binary / load_binary   ms per project
+
+Each timing is the median of --repeat runs. Results can be written as JSON
+and are compared against a stored baseline: any metric more than --threshold
+worse than the baseline makes the run exit with status 1. A missing baseline
+is an error (status 2) unless --no-baseline is given, so a run never passes
+silently without comparing against anything.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+import export
+import saving
+import settings
+from bones import Bone
+from timeline import Timeline
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def make_rig(bone_count, depth, keys, sprites, seed=0):
+    """
+    Synthetic skeleton: one root with chains of up to `depth` bones hanging
+    off it, `keys` random keyframes per track and `sprites` distinct sprite
+    surfaces shared round-robin (0 = no sprites).
+    """
+    rng = random.Random(seed)
+    images = []
+    for i in range(sprites):
+        image = pygame.Surface((rng.randint(16, 64), rng.randint(16, 64)), pygame.SRCALPHA)
+        image.fill((rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255), 200))
+        images.append(image)
+
+    bones = []
+    for i in range(bone_count):
+        if i == 0:
+            parent = None
+        elif (i - 1) % max(1, depth - 1) == 0:
+            parent = bones[0]  # start a new chain under the root
+        else:
+            parent = bones[-1]
+        timeline = Timeline.from_arrays(
+            sorted(rng.uniform(0, settings.MAX_TIME) for _ in range(keys)),
+            [rng.uniform(-180, 180) for _ in range(keys)],
+        )
+        bone = Bone(
+            f"bone{i}", rng.randint(10, 40), timeline, parent=parent,
+            image=images[i % sprites] if sprites else None,
+        )
+        bones.append(bone)
+    bones[0].x, bones[0].y = settings.SCREEN_WIDTH // 2, settings.SCREEN_HEIGHT // 2
+    return bones
+
+
+def _median_time(run, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def bench_timeline(bones, queries, repeat):
+    timelines = [bone.timeline for bone in bones]
+    per_track = max(1, queries // len(timelines))
+    sequential = [settings.MAX_TIME * i / per_track for i in range(per_track)]
+    shuffled = random.Random(1).sample(sequential, len(sequential))
+
+    def run(times):
+        for timeline in timelines:
+            get = timeline.get_angle_at
+            for t in times:
+                get(t)
+
+    calls = per_track * len(timelines)
+    return {
+        "timeline_sequential": (calls / _median_time(lambda: run(sequential), repeat), "calls/s", "higher"),
+        "timeline_random": (calls / _median_time(lambda: run(shuffled), repeat), "calls/s", "higher"),
+    }
+
+
+def bench_pose_and_draw(bones, frames, repeat):
+    roots = [bone for bone in bones if bone.parent is None]
+    times = [settings.MAX_TIME * i / frames for i in range(frames)]
+    surface = pygame.Surface((settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT))
+
+    def update():
+        for t in times:
+            for bone in bones:
+                bone.angle = bone.timeline.get_angle_at(t, default=bone.angle)
+            for root in roots:
+                root.update()
+
+    def draw():
+        for _ in range(frames):
+            surface.fill((30, 30, 30))
+            for root in roots:
+                root.draw(surface, None)
+
+    return {
+        "bone_update": (_median_time(update, repeat) / frames * 1000, "ms/frame", "lower"),
+        "bone_draw": (_median_time(draw, repeat) / frames * 1000, "ms/frame", "lower"),
+    }
+
+
+def bench_export(bones, frames, repeat, folder):
+    surface = pygame.Surface((settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT))
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            export.export_animation_frames(
+                bones, surface, total_frames=frames, fps=settings.FPS,
+                output_folder=os.path.join(folder, "frames"),
+            )
+
+    return {"export": (frames / _median_time(run, repeat), "frames/s", "higher")}
+
+
+def bench_save_load(bones, repeat, folder):
+    results = {}
+    for fmt, filename in (("json", "project.json"), ("binary", "project" + saving.BINARY_EXTENSION)):
+        path = os.path.join(folder, filename)
+        with contextlib.redirect_stdout(io.StringIO()):
+            save = _median_time(lambda: saving.save_project(bones, path), repeat)
+            load = _median_time(
+                lambda: saving.load_project([], path, bone_class=Bone, timeline_class=Timeline, load_images=False),
+                repeat,
+            )
+        results[f"save_{fmt}"] = (save * 1000, "ms", "lower")
+        results[f"load_{fmt}"] = (load * 1000, "ms", "lower")
+    return results
+
+
+def run_suite(args):
+    pygame.display.init()
+    pygame.font.init()
+    pygame.display.set_mode((1, 1))
+    try:
+        bones = make_rig(args.bones, args.depth, args.keys, args.sprites)
+        metrics = {}
+        metrics.update(bench_timeline(bones, args.queries, args.repeat))
+        metrics.update(bench_pose_and_draw(bones, args.frames, args.repeat))
+        with tempfile.TemporaryDirectory(prefix="sprote_bench_") as folder:
+            metrics.update(bench_export(bones, args.export_frames, args.repeat, folder))
+            metrics.update(bench_save_load(bones, args.repeat, folder))
+    finally:
+        pygame.quit()
+
+    return {
+        "config": {
+            "bones": args.bones, "depth": args.depth, "keys": args.keys, "sprites": args.sprites,
+            "frames": args.frames, "export_frames": args.export_frames, "queries": args.queries,
+            "repeat": args.repeat, "python": sys.version.split()[0],
+        },
+        "metrics": {
+            name: {"value": value, "unit": unit, "better": better}
+            for name, (value, unit, better) in metrics.items()
+        },
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Relative change of every metric against `baseline` (positive = worse).
+    Returns (rows, regressions) where rows are (name, old, new, change).
+    """
+    rows = []
+    regressions = []
+    for name, metric in results["metrics"].items():
+        old = baseline.get("metrics", {}).get(name)
+        if old is None or not old["value"]:
+            continue
+        change = (metric["value"] - old["value"]) / old["value"]
+        if metric["better"] == "higher":
+            change = -change
+        rows.append((name, old["value"], metric["value"], change))
+        if change > threshold:
+            regressions.append(name)
+    return rows, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--bones", type=int, default=200)
+    parser.add_argument("--depth", type=int, default=8, help="maximum hierarchy depth")
+    parser.add_argument("--keys", type=int, default=50, help="keyframes per track")
+    parser.add_argument("--sprites", type=int, default=20, help="distinct sprites (0 = none)")
+    parser.add_argument("--frames", type=int, default=60, help="frames for the update/draw benchmarks")
+    parser.add_argument("--export-frames", type=int, default=30)
+    parser.add_argument("--queries", type=int, default=200_000, help="get_angle_at calls per pattern")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", metavar="OUT", help="write results to this file ('-' for stdout)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="baseline results to compare against (record one with --save-baseline)")
+    parser.add_argument("--no-baseline", action="store_true",
+                        help="only measure; don't compare against a baseline")
+    parser.add_argument("--save-baseline", metavar="FILE", help="store these results as a baseline")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="fail if a metric is this fraction worse than the baseline")
+    args = parser.parse_args(argv)
+    if args.bones < 1 or args.depth < 1:
+        parser.error("--bones and --depth must be at least 1")
+    compare_baseline = not (args.no_baseline or args.save_baseline)
+    if compare_baseline and not os.path.isfile(args.baseline):
+        print(
+            f"error: no baseline at {args.baseline}. Record one on this machine with\n"
+            f"    python -m benchmarks.suite --save-baseline {args.baseline}\n"
+            f"or pass --no-baseline to only measure.",
+            file=sys.stderr,
+        )
+        return 2
+
+    results = run_suite(args)
+
+    if args.json == "-":
+        print(json.dumps(results, indent=2))
+    else:
+        for name, metric in results["metrics"].items():
+            print(f"{name:<20} {metric['value']:>14.3f} {metric['unit']}")
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {args.save_baseline}")
+        return 0
+
+    if compare_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        rig = {k: v for k, v in results["config"].items() if k != "python"}
+        if {k: v for k, v in baseline.get("config", {}).items() if k != "python"} != rig:
+            print("Warning: baseline was recorded with a different rig configuration", file=sys.stderr)
+        rows, regressions = compare(results, baseline, args.threshold)
+        print(f"\nAgainst {args.baseline} (threshold {args.threshold:.0%}):", file=sys.stderr)
+        for name, old, new, change in rows:
+            flag = "  REGRESSION" if name in regressions else ""
+            print(f"{name:<20} {old:>14.3f} -> {new:>14.3f} ({(new - old) / old:+.1%}){flag}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,37 +1,136 @@
 import pygame
 import math
 
+from fonts import get_font, render_text
+from sprite_cache import rotate_sprite
+
 SCREEN_WIDTH, SCREEN_HEIGHT = 800, 600  # fallback; you can import from settings.py if preferred
 
 class Bone:
     def __init__(self, name, length, timeline, angle=0, parent=None, image=None, image_path=None, offset=(0, 0)):
+        # _dirty: this bone's local transform changed, so its whole subtree
+        # needs re-solving. _dirty_below: some descendant is dirty. Ancestors
+        # of a flagged bone are always flagged too, which lets update() skip
+        # clean subtrees and lets invalidation stop at the first flagged parent.
+        self._dirty = True
+        self._dirty_below = False
         self.name = name
-        self.length = length
-        self.angle = angle  # in degrees
         self.parent = parent
+        self._length = length
+        self._angle = angle  # in degrees
+        self._x = 0
+        self._y = 0
         self.image = image  # pygame.Surface or None
         self.image_path = image_path  # store the path string here for saving/loading
         self.offset = offset
         self.timeline = timeline
         self.children = []
-        self.x = 0
-        self.y = 0
         self.global_angle = 0
         if parent:
             parent.children.append(self)
+        self.invalidate()
+
+    def invalidate(self):
+        """Mark this bone's subtree as needing a pose update."""
+        self._dirty = True
+        bone = self.parent
+        while bone is not None and not bone._dirty_below:
+            bone._dirty_below = True
+            bone = bone.parent
+
+    @property
+    def needs_update(self):
+        """True if update() would change anything in this bone's subtree."""
+        return self._dirty or self._dirty_below
+
+    @property
+    def angle(self):
+        return self._angle
+
+    @angle.setter
+    def angle(self, value):
+        if value != self._angle:
+            self._angle = value
+            self.invalidate()
+
+    @property
+    def length(self):
+        return self._length
+
+    @length.setter
+    def length(self, value):
+        if value != self._length:
+            self._length = value
+            self.invalidate()
+
+    @property
+    def x(self):
+        return self._x
+
+    @x.setter
+    def x(self, value):
+        if value != self._x:
+            self._x = value
+            self.invalidate()
+
+    @property
+    def y(self):
+        return self._y
+
+    @y.setter
+    def y(self, value):
+        if value != self._y:
+            self._y = value
+            self.invalidate()
+
+    def set_pose(self, angle, x, y, global_angle):
+        """Store an already-solved pose (e.g. from skeleton.Skeleton) and mark it clean."""
+        self._angle = angle
+        self._x = x
+        self._y = y
+        self.global_angle = global_angle
+        self._dirty = False
+        self._dirty_below = False
 
     def update(self):
-        if self.parent:
-            px, py = self.parent.get_end()
-            self.x, self.y = px, py
-            self.global_angle = self.parent.global_angle + self.angle
-        else:
-            self.x = self.x or SCREEN_WIDTH // 2
-            self.y = self.y or SCREEN_HEIGHT // 2
-            self.global_angle = self.angle
+        """
+        Re-solve world transforms, visiting only dirty parts of the subtree.
+        Returns the bones whose transform was recomputed.
+        """
+        if not (self._dirty or self._dirty_below):
+            return []
+        solved = []
+        if self._dirty:
+            solved.append(self)
+            if self.parent:
+                self._x, self._y = self.parent.get_end()
+                self.global_angle = self.parent.global_angle + self._angle
+            else:
+                self._x = self._x or SCREEN_WIDTH // 2
+                self._y = self._y or SCREEN_HEIGHT // 2
+                self.global_angle = self._angle
 
-        for child in self.children:
-            child.update()
+        # Walk the subtree with an explicit stack (no recursion limit on long
+        # chains) and compute each parent's end point once for all its children.
+        stack = [self]
+        while stack:
+            bone = stack.pop()
+            moved = bone._dirty
+            bone._dirty = False
+            bone._dirty_below = False
+            end = None
+            for child in bone.children:
+                if moved or child._dirty:
+                    if end is None:
+                        end = bone.get_end()
+                    child._x, child._y = end
+                    child.global_angle = bone.global_angle + child._angle
+                    child._dirty = True
+                    solved.append(child)
+                    stack.append(child)
+                elif child._dirty_below:
+                    stack.append(child)
+        return solved
 
     def get_end(self):
         rad = math.radians(self.global_angle)
@@ -39,7 +138,20 @@ class Bone:
         ey = self.y + self.length * math.sin(rad)
         return ex, ey
 
-    def draw(self, surface, selected_bone):
+    def draw(self, surface, selected_bone, exact_rotation=False):
+        # Iterative pre/post-order walk: each bone's body is drawn before its
+        # children and its label after them, same as the recursive version.
+        stack = [(self, False)]
+        while stack:
+            bone, children_done = stack.pop()
+            if children_done:
+                bone.draw_label(surface)
+                continue
+            bone.draw_body(surface, selected_bone, exact_rotation)
+            stack.append((bone, True))
+            stack.extend((child, False) for child in reversed(bone.children))
+
+    def draw_body(self, surface, selected_bone, exact_rotation=False):
         end_x, end_y = self.get_end()
         pygame.draw.line(surface, (255, 255, 0), (self.x, self.y), (end_x, end_y), 3)
         if self == selected_bone:
@@ -48,19 +160,37 @@ class Bone:
             pygame.draw.circle(surface, (255, 0, 0), (int(self.x), int(self.y)), 5)
 
         if self.image:
-            rotated = pygame.transform.rotate(self.image, -self.global_angle)
+            rotated = rotate_sprite(self.image, -self.global_angle, exact=exact_rotation)
             rect = rotated.get_rect()
             rect.center = (self.x, self.y)
             surface.blit(rotated, rect.topleft)
 
-        for child in self.children:
-            child.draw(surface, selected_bone)
-
+    def draw_label(self, surface):
         if self.name:
-            font = pygame.font.SysFont(None, 18)
-            angle_txt = font.render(f"{self.name}: {int(self.angle)}°", True, (255, 255, 255))
+            angle_txt = render_text(get_font(None, 18), f"{self.name}: {int(self.angle)}°", (255, 255, 255))
             surface.blit(angle_txt, (int(self.x + 10), int(self.y)))
 
+    def bounds(self):
+        """Screen rect covering everything draw_body and draw_label paint for this bone."""
+        end_x, end_y = self.get_end()
+        rect = pygame.Rect(
+            int(min(self.x, end_x)) - 8,
+            int(min(self.y, end_y)) - 8,
+            int(abs(end_x - self.x)) + 17,
+            int(abs(end_y - self.y)) + 17,
+        )
+        if self.image:
+            w, h = self.image.get_size()
+            rad = math.radians(self.global_angle)
+            cos, sin = abs(math.cos(rad)), abs(math.sin(rad))
+            sprite = pygame.Rect(0, 0, int(w * cos + h * sin) + 2, int(w * sin + h * cos) + 2)
+            sprite.center = (int(self.x), int(self.y))
+            rect.union_ip(sprite)
+        if self.name:
+            label = render_text(get_font(None, 18), f"{self.name}: {int(self.angle)}°", (255, 255, 255))
+            rect.union_ip(label.get_rect(topleft=(int(self.x + 10), int(self.y))))
+        return rect
+
     def is_clicked(self, mouse_pos, radius=10):
         dx = mouse_pos[0] - self.x
         dy = mouse_pos[1] - self.y
@@ -70,3 +200,20 @@ class Bone:
         dx = mouse_pos[0] - self.x
         dy = mouse_pos[1] - self.y
         self.angle = math.degrees(math.atan2(dy, dx))
+
+
+def draw_bounds(bones):
+    """
+    Union of bounds() for every bone drawn from the roots in `bones` (the
+    same bones Bone.draw reaches), or None if nothing is drawn.
+    """
+    rect = None
+    stack = [bone for bone in bones if bone.parent is None]
+    while stack:
+        bone = stack.pop()
+        if rect is None:
+            rect = bone.bounds()
+        else:
+            rect.union_ip(bone.bounds())
+        stack.extend(bone.children)
+    return rect
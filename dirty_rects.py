@@ -0,0 +1,62 @@
+import pygame
+
+
+class DirtyRegions:
+    """
+    Collects the screen areas that need redrawing this frame.
+
+    Each layer reports a signature of whatever it draws from plus the rects
+    it covers; when the signature changes, both the rects it covered last
+    time and the ones it covers now are invalidated. take() hands back the
+    merged rects to redraw and pass to pygame.display.update.
+    """
+
+    # Above this fraction of the screen a single full redraw is cheaper
+    # than redrawing many overlapping pieces.
+    FULL_REDRAW_RATIO = 0.6
+
+    def __init__(self, screen_rect):
+        self.screen_rect = pygame.Rect(screen_rect)
+        self._rects = []
+        self._layers = {}
+
+    def mark(self, rect):
+        rect = pygame.Rect(rect).clip(self.screen_rect)
+        if rect.width and rect.height:
+            self._rects.append(rect)
+
+    def mark_all(self):
+        self._rects = [self.screen_rect.copy()]
+
+    def track(self, name, signature, *rects):
+        """Invalidate layer `name` if its signature changed. Returns True if it did."""
+        previous = self._layers.get(name)
+        if previous is not None and previous[0] == signature:
+            return False
+        if previous is not None:
+            for rect in previous[1]:
+                self.mark(rect)
+        for rect in rects:
+            self.mark(rect)
+        self._layers[name] = (signature, rects)
+        return True
+
+    def take(self):
+        """Merged dirty rects for this frame; the list is cleared."""
+        rects, self._rects = self._rects, []
+        if not rects:
+            return []
+        area = sum(r.width * r.height for r in rects)
+        if area >= self.FULL_REDRAW_RATIO * self.screen_rect.width * self.screen_rect.height:
+            return [self.screen_rect.copy()]
+
+        merged = []
+        for rect in rects:
+            # Fold in every already-merged rect this one overlaps, repeatedly,
+            # so the result has no overlapping pieces to draw twice.
+            i = rect.collidelist(merged)
+            while i != -1:
+                rect = rect.union(merged.pop(i))
+                i = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
@@ -1,6 +1,204 @@
-import pygame
+import argparse
 import os
-from PIL import Image
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+import numpy as np
+from PIL import Image, ImageChops, GifImagePlugin
+
+from fonts import get_font
+from skeleton import Skeleton
+
+
+def solve_clip_poses(bones, frame_indices, fps, pose_cache=None):
+    """
+    Sample every track and solve world transforms for the given frames up front.
+
+    Returns (skeleton, angles, x, y, global_angle); the pose arrays are shaped
+    (len(frame_indices), len(skeleton)) so each frame only has to apply a row.
+    If `pose_cache` (a pose_cache.PoseCache) has every frame baked, its rows
+    are used instead.
+    """
+    if pose_cache is not None:
+        cached = pose_cache.clip(bones, frame_indices, fps)
+        if cached is not None:
+            return cached
+    skeleton = Skeleton(bones)
+    frame_times = np.asarray(frame_indices, dtype=np.float64) / fps
+    angles = skeleton.sample_clip(frame_times)
+    return (skeleton, angles) + skeleton.solve_clip(angles)
+
+
+def animated_bounds(bones, total_frames, fps, padding=0, chunk_frames=1024):
+    """
+    Screen-space pygame.Rect covering everything the clip draws.
+
+    Computed from the solved poses rather than by rendering: bone segments
+    and joint markers, rotated sprite rects and bone labels are unioned over
+    every frame, `chunk_frames` frames at a time so memory stays bounded.
+    """
+    skeleton = Skeleton(bones)
+    lengths = skeleton.bone_lengths()
+    marker = 8  # joint circle radius 7 plus line width
+    sprites = [(i, b.image.get_size()) for i, b in enumerate(skeleton.bones) if b.image]
+    font = get_font(None, 18)
+    labels = [
+        (i, font.size(f"{b.name}: -0000°")) for i, b in enumerate(skeleton.bones) if b.name
+    ]
+
+    left = top = np.inf
+    right = bottom = -np.inf
+    for first in range(0, total_frames, chunk_frames):
+        frames = range(first, min(first + chunk_frames, total_frames))
+        angles = skeleton.sample_clip(np.asarray(frames, dtype=np.float64) / fps)
+        xs, ys, global_angles = skeleton.solve_clip(angles)
+        rad = np.radians(global_angles)
+        ex = xs + lengths * np.cos(rad)
+        ey = ys + lengths * np.sin(rad)
+        boxes = [
+            (np.minimum(xs, ex) - marker, np.minimum(ys, ey) - marker,
+             np.maximum(xs, ex) + marker, np.maximum(ys, ey) + marker),
+        ]
+        for i, (w, h) in sprites:
+            cos, sin = np.abs(np.cos(rad[:, i])), np.abs(np.sin(rad[:, i]))
+            half_w = (w * cos + h * sin) / 2 + 1
+            half_h = (w * sin + h * cos) / 2 + 1
+            boxes.append((xs[:, i] - half_w, ys[:, i] - half_h, xs[:, i] + half_w, ys[:, i] + half_h))
+        for i, (w, h) in labels:
+            boxes.append((xs[:, i] + 10, ys[:, i], xs[:, i] + 10 + w, ys[:, i] + h))
+        for box_left, box_top, box_right, box_bottom in boxes:
+            left = min(left, box_left.min())
+            top = min(top, box_top.min())
+            right = max(right, box_right.max())
+            bottom = max(bottom, box_bottom.max())
+
+    if not np.isfinite(left):
+        return pygame.Rect(0, 0, 1, 1)
+    left, top = int(np.floor(left)) - padding, int(np.floor(top)) - padding
+    right, bottom = int(np.ceil(right)) + padding, int(np.ceil(bottom)) + padding
+    return pygame.Rect(left, top, right - left, bottom - top)
+
+
+def _render_target(bones, screen, total_frames, fps, crop, crop_padding):
+    """Surface to render into and the (x, y) shift to apply to every pose."""
+    if not crop:
+        return screen, (0, 0)
+    bounds = animated_bounds(bones, total_frames, fps, padding=crop_padding)
+    print(f"[EXPORT] Cropping to {bounds.width}x{bounds.height} at ({bounds.x}, {bounds.y})")
+    return pygame.Surface(bounds.size, 0, screen), (bounds.x, bounds.y)
+
+
+def _restore_root_positions(root_positions):
+    """Put roots back where the editor had them after poses were applied for export."""
+    for bone, x, y in root_positions:
+        bone.x = x
+        bone.y = y
+
+
+def _surface_rawmode(surface):
+    """Pillow raw mode describing the byte order of `surface`'s pixels, e.g. "BGRX"."""
+    bytesize = surface.get_bytesize()
+    if bytesize not in (3, 4):
+        raise ValueError(f"unsupported surface depth: {surface.get_bitsize()} bits")
+    channels = {
+        shift: name
+        for name, mask, shift in zip("RGBA", surface.get_masks(), surface.get_shifts())
+        if mask
+    }
+    order = [channels.get(8 * i, "X") for i in range(bytesize)]
+    if sys.byteorder == "big":
+        order.reverse()
+    return "".join(order)
+
+
+def surface_to_image(surface):
+    """
+    Decode a Surface's pixels straight into a PIL Image.
+
+    Pillow reads the pixel memory through the buffer protocol
+    (Surface.get_buffer) and unpacks it in a single pass, so there is no
+    intermediate byte string as with pygame.image.tostring. frombytes()
+    always decodes into a new image (frombuffer() would map layouts that
+    already match Pillow's without copying), so the returned image owns its
+    pixels and stays valid after the surface is redrawn.
+    """
+    rawmode = _surface_rawmode(surface)
+    mode = "RGBA" if surface.get_flags() & pygame.SRCALPHA else "RGB"
+    if mode == "RGB":
+        rawmode = rawmode.replace("A", "X")
+    view = surface.get_buffer()
+    try:
+        with memoryview(view) as pixels:
+            return Image.frombytes(mode, surface.get_size(), pixels, "raw", rawmode, surface.get_pitch(), 1)
+    finally:
+        # Dropping the view unlocks the surface so it can be blitted to again.
+        del view
+
+
+class FrameWriter:
+    """
+    Encodes and writes PNG frames on a small thread pool.
+
+    submit() decodes the surface's pixels into an image on the calling
+    thread, so the caller can immediately draw the next frame, and blocks once
+    `max_pending` frames are queued so memory stays bounded. Pillow releases
+    the GIL while compressing, so encoding overlaps with rendering.
+    """
+
+    def __init__(self, workers=None, max_pending=None):
+        workers = workers or min(4, os.cpu_count() or 1)
+        self.max_pending = max_pending or workers * 2
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="frame-writer")
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._error = None
+        self.frames_written = 0
+        self.bytes_written = 0
+
+    def submit(self, surface, filename):
+        self._raise_pending_error()
+        image = surface_to_image(surface)
+        self._slots.acquire()
+        future = self._pool.submit(self._write, image, filename)
+        future.add_done_callback(self._done)
+
+    def _write(self, image, filename):
+        image.save(filename, "PNG")
+        return os.path.getsize(filename)
+
+    def _done(self, future):
+        self._slots.release()
+        error = future.exception()
+        with self._lock:
+            if error is not None:
+                self._error = self._error or error
+            else:
+                self.frames_written += 1
+                self.bytes_written += future.result()
+
+    def _raise_pending_error(self):
+        if self._error is not None:
+            raise self._error
+
+    def close(self):
+        """Wait for every queued frame to be written."""
+        self._pool.shutdown(wait=True)
+        self._raise_pending_error()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._pool.shutdown(wait=True)
+        if exc_type is None:
+            self._raise_pending_error()
+
 
 def export_animation_frames(
     bones,
@@ -9,7 +207,14 @@ def export_animation_frames(
     total_frames=None,
     animation_length=None,  # in seconds
     fps=60,
-    output_folder="exported_frames"
+    output_folder="exported_frames",
+    exact_rotation=True,
+    writer_threads=None,
+    max_pending_frames=None,
+    frame_range=None,
+    crop=False,
+    crop_padding=8,
+    pose_cache=None
 ):
     """
     Export animation frames as PNG images.
@@ -21,9 +226,21 @@ def export_animation_frames(
         animation_length: float, seconds of animation duration.
         fps: frames per second.
         output_folder: folder to save PNG frames.
+        exact_rotation: rotate sprites by their exact angle instead of using
+            the quantized rotation cache.
+        writer_threads: PNG encoder threads (default: up to 4).
+        max_pending_frames: frames allowed to queue for encoding before
+            rendering waits (default: 2 per writer thread).
+        frame_range: optional (start, stop) to render only part of the clip.
+            Files keep their clip-wide frame_XXXX.png numbering.
+        crop: render only the skeleton's bounding box over the whole clip
+            (see animated_bounds) instead of the full screen.
+        crop_padding: pixels of background kept around the cropped box.
+        pose_cache: optional PoseCache to take already-baked poses from.
 
     If total_frames is None, calculated from animation_length * fps.
     If animation_length is None, defaults to 5.0 seconds.
+    Frames are rendered as fast as possible; nothing throttles to real time.
     """
     if animation_length is None and total_frames is None:
         animation_length = 5.0
@@ -34,27 +251,127 @@ def export_animation_frames(
         raise ValueError("total_frames must be positive")
 
     os.makedirs(output_folder, exist_ok=True)
-    clock = pygame.time.Clock()
+    first, stop = frame_range if frame_range is not None else (0, total_frames)
+    frame_indices = range(max(first, 0), min(stop, total_frames))
+
+    start = time.perf_counter()
+    target, (shift_x, shift_y) = _render_target(bones, screen, total_frames, fps, crop, crop_padding)
+    skeleton, angles, xs, ys, global_angles = solve_clip_poses(bones, frame_indices, fps, pose_cache)
+    root_positions = [(bone, bone.x, bone.y) for bone in bones if bone.parent is None]
+    xs -= shift_x
+    ys -= shift_y
+
+    try:
+        with FrameWriter(writer_threads, max_pending_frames) as writer:
+            for i, frame_idx in enumerate(frame_indices):
+                target.fill((30, 30, 30))
+
+                skeleton.apply(angles[i], xs[i], ys[i], global_angles[i])
+
+                for bone in bones:
+                    if bone.parent is None:
+                        bone.draw(target, None, exact_rotation=exact_rotation)
+
+                filename = os.path.join(output_folder, f"frame_{frame_idx:04d}.png")
+                writer.submit(target, filename)
+    finally:
+        _restore_root_positions(root_positions)
+
+    elapsed = time.perf_counter() - start
+    print(f"[EXPORT] Exported {len(frame_indices)} frames to '{output_folder}'")
+    print(
+        f"[EXPORT] {elapsed:.2f}s, {len(frame_indices) / elapsed:.1f} frames/s, "
+        f"{writer.bytes_written / (1024 * 1024):.2f} MB written"
+    )
+
+
+class StreamingGifWriter:
+    """
+    Writes an animated GIF one frame at a time.
+
+    Each frame is quantized and LZW-encoded as soon as it is added, and only
+    the previous frame is kept (to encode just the changed rectangle), so
+    memory use does not grow with clip length and data reaches the file
+    immediately.
+
+    palette="per_frame" quantizes every frame on its own and stores a local
+    color table with it. palette="shared" builds one global palette from the
+    first frame and maps later frames onto it, which is smaller and avoids
+    palette flicker but can lose colors that only appear later.
+    """
+
+    PALETTES = ("per_frame", "shared")
+
+    def __init__(self, filename, size, duration, loop=0, palette="per_frame"):
+        if palette not in self.PALETTES:
+            raise ValueError(f"palette must be one of {self.PALETTES}, not {palette!r}")
+        self.size = size
+        self.duration = duration
+        self.loop = loop
+        self.palette = palette
+        self.frames_written = 0
+        self._palette_image = None
+        self._previous = None
+        self._fp = open(filename, "wb")
+
+    def _write_header(self, palette_bytes=b""):
+        flags = 0
+        if palette_bytes:
+            flags = 0x80 | 7  # global color table, 256 entries
+        self._fp.write(b"GIF89a" + struct.pack("<HHBBB", self.size[0], self.size[1], flags, 0, 0))
+        if palette_bytes:
+            self._fp.write(palette_bytes[:768].ljust(768, b"\0"))
+        if self.loop is not None:
+            self._fp.write(b"!\xff\x0bNETSCAPE2.0\x03\x01" + struct.pack("<H", self.loop) + b"\0")
 
-    for frame_idx in range(total_frames):
-        current_time = frame_idx / fps
+    def add_frame(self, image):
+        """Quantize, encode and write one RGB(A) PIL image of the writer's size."""
+        if image.mode != "RGB":
+            image = image.convert("RGB")
 
-        screen.fill((30, 30, 30))
+        if self._previous is None:
+            bbox = (0, 0) + image.size
+        else:
+            # Only encode what changed; "do not dispose" keeps the rest on screen.
+            bbox = ImageChops.difference(self._previous, image).getbbox() or (0, 0, 1, 1)
+        region = image.crop(bbox)
 
-        for bone in bones:
-            bone.angle = bone.timeline.get_angle_at(current_time, default=bone.angle)
+        if self.palette == "shared":
+            if self._palette_image is None:
+                self._palette_image = image.quantize(256)
+                self._write_header(bytes(self._palette_image.getpalette()))
+            frame = region.quantize(palette=self._palette_image, dither=Image.Dither.NONE)
+        else:
+            if self._previous is None:
+                self._write_header()
+            frame = region.quantize(256)
 
-        for bone in bones:
-            if bone.parent is None:
-                bone.update()
-                bone.draw(screen, None)
+        for chunk in GifImagePlugin.getdata(
+            frame,
+            offset=bbox[:2],
+            duration=self.duration,
+            disposal=1,
+            include_color_table=self.palette == "per_frame",
+        ):
+            self._fp.write(chunk)
 
-        filename = os.path.join(output_folder, f"frame_{frame_idx:04d}.png")
-        pygame.image.save(screen, filename)
+        self._previous = image
+        self.frames_written += 1
 
-        clock.tick(fps // 2)
+    def close(self):
+        if self._fp.closed:
+            return
+        try:
+            if self.frames_written:
+                self._fp.write(b";")
+        finally:
+            self._fp.close()
 
-    print(f"[EXPORT] Exported {total_frames} frames to '{output_folder}'")
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
 
 
 def export_animation_gif(
@@ -64,7 +381,12 @@ def export_animation_gif(
     total_frames=None,
     animation_length=None,
     fps=60,
-    output_gif="exported_animation.gif"
+    output_gif="exported_animation.gif",
+    exact_rotation=True,
+    palette="per_frame",
+    crop=False,
+    crop_padding=8,
+    pose_cache=None
 ):
     """
     Export animation as an animated GIF.
@@ -76,9 +398,18 @@ def export_animation_gif(
         animation_length: float, seconds duration.
         fps: frames per second.
         output_gif: filename for the GIF.
+        exact_rotation: rotate sprites by their exact angle instead of using
+            the quantized rotation cache.
+        palette: "per_frame" or "shared", see StreamingGifWriter.
+        crop: render only the skeleton's bounding box over the whole clip
+            (see animated_bounds) instead of the full screen.
+        crop_padding: pixels of background kept around the cropped box.
+        pose_cache: optional PoseCache to take already-baked poses from.
 
     If total_frames is None, calculated from animation_length * fps.
     If animation_length is None, defaults to 5.0 seconds.
+    Frames are encoded as they are rendered, so memory use is constant in
+    clip length.
     """
     if animation_length is None and total_frames is None:
         animation_length = 5.0
@@ -88,31 +419,229 @@ def export_animation_gif(
     elif total_frames <= 0:
         raise ValueError("total_frames must be positive")
 
-    frames = []
+    target, (shift_x, shift_y) = _render_target(bones, screen, total_frames, fps, crop, crop_padding)
+    skeleton, angles, xs, ys, global_angles = solve_clip_poses(bones, range(total_frames), fps, pose_cache)
+    root_positions = [(bone, bone.x, bone.y) for bone in bones if bone.parent is None]
+    xs -= shift_x
+    ys -= shift_y
+    size = target.get_size()
+
+    try:
+        with StreamingGifWriter(output_gif, size, int(1000 / fps), loop=0, palette=palette) as writer:
+            for frame_idx in range(total_frames):
+                target.fill((30, 30, 30))
 
-    for frame_idx in range(total_frames):
-        current_time = frame_idx / fps
+                skeleton.apply(angles[frame_idx], xs[frame_idx], ys[frame_idx], global_angles[frame_idx])
 
-        screen.fill((30, 30, 30))
+                for bone in bones:
+                    if bone.parent is None:
+                        bone.draw(target, None, exact_rotation=exact_rotation)
 
-        for bone in bones:
-            bone.angle = bone.timeline.get_angle_at(current_time, default=bone.angle)
+                writer.add_frame(surface_to_image(target))
+    finally:
+        _restore_root_positions(root_positions)
 
-        for bone in bones:
-            if bone.parent is None:
-                bone.update()
-                bone.draw(screen, None)
+    print(f"[EXPORT] GIF saved as '{output_gif}'")
 
-        raw_str = pygame.image.tostring(screen, "RGBA", False)
-        pil_image = Image.frombytes("RGBA", screen.get_size(), raw_str)
-        frames.append(pil_image)
 
-    frames[0].save(
-        output_gif,
-        save_all=True,
-        append_images=frames[1:],
-        duration=int(1000 / fps),
-        loop=0
+def export_animation_frames_parallel(
+    bones,
+    *,
+    total_frames=None,
+    animation_length=None,
+    fps=60,
+    output_folder="exported_frames",
+    workers=None,
+    size=(800, 600),
+    exact_rotation=True,
+    crop=False,
+    crop_padding=8
+):
+    """
+    Export PNG frames using several processes, each rendering one contiguous
+    shard of the frame range.
+
+    The project is saved to a temporary file and every worker is a headless
+    `export.py` process that rebuilds the skeleton from it, so output is
+    identical to export_animation_frames on a Surface of the same size.
+    Workers run as fresh interpreters rather than multiprocessing children
+    because main.py starts the editor at import time.
+
+    Args:
+        bones: list of Bone instances.
+        total_frames, animation_length, fps, output_folder: as for
+            export_animation_frames.
+        workers: number of processes (default: CPU count).
+        size: (width, height) of the rendered frames.
+        exact_rotation, crop, crop_padding: as for export_animation_frames.
+            Every worker crops to the same whole-clip bounds.
+    """
+    import saving
+
+    if animation_length is None and total_frames is None:
+        animation_length = 5.0
+
+    if total_frames is None:
+        total_frames = int(animation_length * fps)
+    elif total_frames <= 0:
+        raise ValueError("total_frames must be positive")
+
+    workers = max(1, min(workers or os.cpu_count() or 1, total_frames))
+    output_folder = os.path.abspath(output_folder)
+    os.makedirs(output_folder, exist_ok=True)
+    start = time.perf_counter()
+
+    with tempfile.TemporaryDirectory(prefix="sprote_export_") as tmp:
+        # The binary format stores parents by index, so unnamed bones and
+        # duplicate names come back with the same hierarchy in every worker.
+        project_file = os.path.join(tmp, "project" + saving.BINARY_EXTENSION)
+        saving.write_records(saving.records_from_bones(bones), project_file)
+
+        bounds = [total_frames * i // workers for i in range(workers + 1)]
+        processes = []
+        for first, stop in zip(bounds, bounds[1:]):
+            cmd = [
+                sys.executable, os.path.abspath(__file__), project_file,
+                "--fps", str(fps),
+                "--frames", str(total_frames),
+                "--range", str(first), str(stop),
+                "--out", output_folder,
+                "--size", str(size[0]), str(size[1]),
+            ]
+            if not exact_rotation:
+                cmd.append("--cached-rotation")
+            if crop:
+                cmd += ["--crop", "--crop-padding", str(crop_padding)]
+            processes.append(subprocess.Popen(cmd, stdout=subprocess.DEVNULL))
+
+        failed = [p.args for p in processes if p.wait() != 0]
+
+    if failed:
+        raise RuntimeError(f"{len(failed)} of {workers} export workers failed")
+
+    elapsed = time.perf_counter() - start
+    print(f"[EXPORT] Exported {total_frames} frames to '{output_folder}' with {workers} workers")
+    print(f"[EXPORT] {elapsed:.2f}s, {total_frames / elapsed:.1f} frames/s")
+
+
+def render_project_headless(
+    project_file,
+    *,
+    fps=60,
+    animation_length=None,
+    total_frames=None,
+    output_folder="exported_frames",
+    output_gif=None,
+    size=(800, 600),
+    frame_range=None,
+    exact_rotation=True,
+    gif_palette="per_frame",
+    crop=False,
+    crop_padding=8,
+):
+    """
+    Render a saved project without opening the editor.
+
+    Uses the SDL dummy video driver (unless another driver is already set)
+    and draws into an offscreen Surface, so it runs on machines with no
+    display. Never imports main.py.
+    """
+    from atlas import TextureAtlas
+    from bones import Bone
+    from timeline import Timeline
+    import saving
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    pygame.font.init()
+    # A (tiny) display mode is still needed for convert()/convert_alpha().
+    pygame.display.set_mode((1, 1))
+    try:
+        bones = saving.load_project([], project_file, bone_class=Bone, timeline_class=Timeline,
+                                    atlas=TextureAtlas())
+        if not bones:
+            raise ValueError(f"No bones loaded from '{project_file}'")
+        surface = pygame.Surface(size)
+        if output_gif:
+            export_animation_gif(
+                bones, surface, total_frames=total_frames, animation_length=animation_length,
+                fps=fps, output_gif=output_gif, exact_rotation=exact_rotation,
+                palette=gif_palette, crop=crop, crop_padding=crop_padding,
+            )
+        else:
+            export_animation_frames(
+                bones, surface, total_frames=total_frames, animation_length=animation_length,
+                fps=fps, output_folder=output_folder, exact_rotation=exact_rotation,
+                frame_range=frame_range, crop=crop, crop_padding=crop_padding,
+            )
+    finally:
+        pygame.quit()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m export",
+        description="Render a saved Sprote project to PNG frames or a GIF without the editor.",
     )
+    parser.add_argument("project", help="project file saved by the editor")
+    parser.add_argument("--fps", type=int, default=60)
+    parser.add_argument("--length", type=float, default=None, help="animation length in seconds (default 5.0)")
+    parser.add_argument("--frames", type=int, default=None, help="total frames; overrides --length")
+    parser.add_argument("--out", default="exported_frames", help="output folder for PNG frames")
+    parser.add_argument("--gif", default=None, help="write an animated GIF to this path instead of PNG frames")
+    parser.add_argument("--size", type=int, nargs=2, default=(800, 600), metavar=("W", "H"))
+    parser.add_argument("--range", type=int, nargs=2, default=None, metavar=("START", "STOP"),
+                        help="render only frames START..STOP-1 (PNG output only)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="render PNG frames in this many processes")
+    parser.add_argument("--gif-palette", choices=StreamingGifWriter.PALETTES, default="per_frame",
+                        help="per-frame local palettes or one shared global palette")
+    parser.add_argument("--crop", action="store_true",
+                        help="crop output to the skeleton's bounding box over the whole clip")
+    parser.add_argument("--crop-padding", type=int, default=8, metavar="PX")
+    parser.add_argument("--cached-rotation", action="store_true",
+                        help="use the quantized sprite rotation cache instead of exact angles")
+    args = parser.parse_args(argv)
 
-    print(f"[EXPORT] GIF saved as '{output_gif}'")
+    if args.workers > 1 and not args.gif:
+        from bones import Bone
+        from timeline import Timeline
+        import saving
+
+        # Each worker process loads the project (and its images) itself.
+        bones = saving.load_project([], args.project, bone_class=Bone, timeline_class=Timeline,
+                                    load_images=False)
+        if not bones:
+            parser.error(f"no bones loaded from '{args.project}'")
+        export_animation_frames_parallel(
+            bones,
+            total_frames=args.frames,
+            animation_length=args.length,
+            fps=args.fps,
+            output_folder=args.out,
+            workers=args.workers,
+            size=tuple(args.size),
+            exact_rotation=not args.cached_rotation,
+            crop=args.crop,
+            crop_padding=args.crop_padding,
+        )
+        return
+
+    render_project_headless(
+        args.project,
+        fps=args.fps,
+        animation_length=args.length,
+        total_frames=args.frames,
+        output_folder=args.out,
+        output_gif=args.gif,
+        size=tuple(args.size),
+        frame_range=tuple(args.range) if args.range else None,
+        exact_rotation=not args.cached_rotation,
+        gif_palette=args.gif_palette,
+        crop=args.crop,
+        crop_padding=args.crop_padding,
+    )
+
+
+if __name__ == "__main__":
+    main()
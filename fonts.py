@@ -0,0 +1,69 @@
+import pygame
+from collections import OrderedDict
+
+TEXT_CACHE_SIZE = 1024
+
+_fonts = {}
+
+
+def get_font(name=None, size=18):
+    """
+    Shared font registry. Returns the same pygame Font for the same
+    (name, size) instead of building a new SysFont on every draw.
+    """
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.SysFont(name, size)
+        _fonts[key] = font
+    return font
+
+
+class TextCache:
+    """
+    LRU cache of rendered text surfaces keyed by (font, text, color, antialias).
+
+    Surfaces are returned shared, so callers must only blit them, never
+    draw onto them.
+    """
+
+    def __init__(self, maxsize=TEXT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._surfaces = OrderedDict()
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, tuple(color), antialias)
+        surf = self._surfaces.get(key)
+        if surf is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surf
+        self.misses += 1
+        surf = font.render(text, antialias, color)
+        self._surfaces[key] = surf
+        if len(self._surfaces) > self.maxsize:
+            self._surfaces.popitem(last=False)
+        return surf
+
+    def clear(self):
+        self._surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._surfaces),
+            "maxsize": self.maxsize,
+        }
+
+
+text_cache = TextCache()
+
+
+def render_text(font, text, color, antialias=True):
+    """Render through the shared text cache."""
+    return text_cache.render(font, text, color, antialias)
@@ -2,11 +2,20 @@ import pygame
 import os
 import math
 
-from bones import Bone
+from atlas import TextureAtlas
+from bones import Bone, draw_bounds
+from dirty_rects import DirtyRegions
+from picking import BoneGrid
+from playback import PlaybackClock
+from pose_cache import PoseCache
+from profiler import FrameProfiler
+from thumbnails import ThumbnailCache
 from timeline import Timeline
+from autosave import Autosave, recover
 import saving
 import export
 import settings
+import fonts
 import UI
 
 # --- Constants ---
@@ -29,20 +38,35 @@ selected_image_path = ""
 
 bones = []
 selected_bone = None
-play_mode = False
+playback = PlaybackClock(MAX_TIME, FPS)
 current_time = 0
 scrubbing_timeline = False
 dragging_bone = None
+hovered_bone = None
 mouse_prev_pos = None
+bone_grid = BoneGrid()
+# Bumped on edits, so the per-frame change checks compare integers instead
+# of rebuilding tuples over every bone.
+bones_version = 0  # bones added, removed or loaded
+keys_version = 0  # keyframes added
+roots = []
+profiler = FrameProfiler(window=settings.PROFILE_WINDOW)
 
 # Initialize Pygame
 pygame.init()
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("Sprote Refactored")
 clock = pygame.time.Clock()
-font = pygame.font.SysFont(None, 24)
+font = fonts.get_font(None, 24)
 
-image_buttons = UI.load_image_buttons(ASSETS_FOLDER)
+thumbnails = ThumbnailCache()
+image_picker = UI.ImagePicker(ASSETS_FOLDER, thumbnails)
+
+atlas = TextureAtlas()
+bones = recover(Bone, Timeline, atlas=atlas)
+autosave = Autosave()
+autosave.start(bones)
+pose_cache = PoseCache(FPS, MAX_TIME)
 
 # Export menu state
 export_settings = {
@@ -79,37 +103,138 @@ def add_bone():
         angle=0,
         parent=new_bone_data["parent"],
         image=new_bone_data["image"],
+        image_path=new_bone_data["image_path"],
         offset=(0, 0),
     )
     bone.x = SCREEN_WIDTH // 2
     bone.y = SCREEN_HEIGHT // 2
     bones.append(bone)
+    autosave.add_bone(bone)
+    bones_changed()
     new_bone_data.update({"name": "", "length": "60", "parent": None, "image": None, "image_path": None})
 
+def load_project():
+    global bones, selected_bone, hovered_bone, dragging_bone, atlas
+    loaded_atlas = TextureAtlas()
+    loaded = saving.load_project([], bone_class=Bone, timeline_class=Timeline, atlas=loaded_atlas)
+    if not loaded:
+        return
+    bones = loaded
+    atlas = loaded_atlas
+    selected_bone = hovered_bone = dragging_bone = None
+    autosave.reset(bones)
+    bones_changed()
+    dirty.mark_all()
+    playback.resync()
+
+def bones_changed():
+    """Call after bones are added, removed or loaded."""
+    global bones_version, roots, hovered_bone
+    bones_version += 1
+    roots = [bone for bone in bones if bone.parent is None]
+    bone_list.invalidate()
+    if hovered_bone is not None and hovered_bone not in bones:
+        hovered_bone = None
+    bone_grid.sync(bones)
+    pose_cache.rebuild(bones)
+
 def update_bone_angles(current_time):
     for bone in bones:
         bone.angle = bone.timeline.get_angle_at(current_time, default=bone.angle)
 
-running = True
-while running:
-    screen.fill((30, 30, 30))
+def pose_at(time):
+    """
+    Pose the bones for `time`, from the baked pose cache if it has the frame
+    and by evaluating every track otherwise. Returns True if the cache
+    changed the pose (set_pose leaves the bones clean, so the caller can't
+    see it through needs_update).
+    """
+    applied = pose_cache.apply(time)
+    if applied is None:
+        update_bone_angles(time)
+        return False
+    return applied
+
+# --- Layer areas (for dirty-rectangle redraws) ---
+y_offset = UI.TOPBAR_HEIGHT
+sidebar_rect = pygame.Rect(SCREEN_WIDTH - SIDEBAR_WIDTH, y_offset, SIDEBAR_WIDTH, TIMELINE_Y)
+bone_list = UI.BoneList(sidebar_rect)
+timeline_rect = pygame.Rect(0, TIMELINE_Y + y_offset, SCREEN_WIDTH, SCREEN_HEIGHT - TIMELINE_Y - y_offset)
+play_button_rect = UI.play_button_rect(SCREEN_WIDTH, SCREEN_HEIGHT)
+
+dirty = DirtyRegions(screen.get_rect())
+dirty.mark_all()
+bones_rect = None
+hud_origin = (4, y_offset + 4)
+
+
+def hover_rect(bone):
+    return pygame.Rect(int(bone.x) - 10, int(bone.y) - 10, 21, 21)
+
+
+def draw_scene(area):
+    """Redraw every layer that intersects `area` (the caller sets the clip)."""
+    screen.fill((30, 30, 30), area)
+    if area.colliderect(top_bar.get_rect(SCREEN_WIDTH)):
+        top_bar.draw(screen)
+    if area.colliderect(sidebar_rect):
+        with profiler.scope("sidebar"):
+            bone_list.draw(screen, bones, selected_bone, font)
+    if area.colliderect(timeline_rect):
+        with profiler.scope("timeline"):
+            UI.draw_timeline(screen, bones, current_time, MAX_TIME, FPS, settings.FRAME_WIDTH, TIMELINE_Y, font,
+                             y_offset=y_offset, version=(bones_version, keys_version))
+    if area.colliderect(play_button_rect):
+        UI.draw_play_button(screen, playback.playing, font, screen_width=SCREEN_WIDTH, screen_height=SCREEN_HEIGHT, y_offset=y_offset)
+
+    if context_menu.visible and area.colliderect(context_menu.get_rect()):
+        context_menu.draw(screen)
 
-    y_offset = UI.TOPBAR_HEIGHT
+    if bones_rect is not None and area.colliderect(bones_rect):
+        with profiler.scope("draw"):
+            for bone in bones:
+                if bone.parent is None:
+                    bone.draw(screen, selected_bone)
 
-    # Draw UI components
-    top_bar.draw(screen)
-    UI.draw_sidebar(screen, bones, selected_bone, font, sidebar_width=SIDEBAR_WIDTH, screen_width=SCREEN_WIDTH, y_offset=0)
-    UI.draw_timeline(screen, bones, current_time, MAX_TIME, FPS, settings.FRAME_WIDTH, TIMELINE_Y, font, y_offset=y_offset)
-    play_button_rect = UI.draw_play_button(screen, play_mode, font, screen_width=SCREEN_WIDTH, screen_height=SCREEN_HEIGHT, y_offset=y_offset)
+    if hovered_bone is not None and hovered_bone is not selected_bone:
+        pygame.draw.circle(screen, (255, 255, 255), (int(hovered_bone.x), int(hovered_bone.y)), 9, 1)
 
-    if context_menu.visible:
-        context_menu.draw(screen)
+    # Draw menus on top if open
+    if menu_open and area.colliderect(UI.MENU_AREA_RECT):
+        if menu_state == "main":
+            UI.draw_main_menu(screen, font)
+        elif menu_state == "add_bone":
+            UI.draw_add_bone_menu(screen, new_bone_data, selected_input_field, font)
+        elif menu_state == "choose_image":
+            UI.draw_image_menu(screen, image_picker, font)
+        elif menu_state == "export":
+            UI.draw_export_menu(screen, export_settings, export_selected_input, font)
+
+    if profiler.hud_lines and area.colliderect(profiler.hud_rect(hud_origin)):
+        profiler.draw_hud(screen, hud_origin, font)
 
+
+bones_changed()
+running = True
+idle = False
+while running:
+    if idle:
+        # Nothing was redrawn last frame and nothing is animating: sleep
+        # until input arrives instead of ticking at FPS. The timeout lets
+        # background results (e.g. thumbnails) still show up.
+        event = pygame.event.wait(settings.IDLE_WAIT_MS)
+        events = [event] if event.type != pygame.NOEVENT else []
+        events += pygame.event.get()
+    else:
+        events = pygame.event.get()
+    profiler.begin_frame()
     shift_held = pygame.key.get_pressed()[pygame.K_LSHIFT] or pygame.key.get_pressed()[pygame.K_RSHIFT]
 
-    for event in pygame.event.get():
+    for event in events:
         if event.type == pygame.QUIT:
             running = False
+        elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            dirty.mark_all()
 
         # UI component event handling
         cmd_top = top_bar.handle_event(event)
@@ -127,19 +252,31 @@ while running:
             elif command == "export_png" or command == "export_gif":
                 # Call your export functions accordingly
                 if command == "export_png":
-                    export.export_animation_frames(bones, screen)
+                    export.export_animation_frames(bones, screen, pose_cache=pose_cache)
                 else:
-                    export.export_animation_gif(bones, screen)
+                    export.export_animation_gif(bones, screen, pose_cache=pose_cache)
+                # Export left the bones posed (and marked clean) at the clip's
+                # last frame. Invalidating the roots makes the pose cache
+                # re-apply the playhead's frame, and again afterwards so the
+                # next frame re-solves and re-indexes the restored pose.
+                export_roots = [bone for bone in bones if bone.parent is None]
+                for bone in export_roots:
+                    bone.invalidate()
+                pose_at(current_time)
+                for bone in export_roots:
+                    bone.invalidate()
+                dirty.mark_all()  # export drew over the whole screen
+                playback.resync()
   # Implement this if you haven't
             elif command == "save":
-                saving.save_project(bones)
+                saving.save_project(bones, atlas=atlas)
             elif command == "load":
-                print("[LOAD] Load function not implemented yet")
+                load_project()
             elif command == "close_menu":
                 menu_open = False
                 menu_state = "main"
             elif command == "toggle_play":
-                play_mode = not play_mode
+                playback.toggle()
             elif command == "open_export":
                 menu_open = True
                 menu_state = "export"  # you need to add export menu drawing logic below
@@ -151,12 +288,11 @@ while running:
                 new_menu_state, new_selected_input, cmd = UI.handle_menu_click(event.pos, menu_state, bones, new_bone_data, export_settings)
                         # Handle image button clicks in choose_image menu
                 if menu_state == "choose_image":
-                    for thumb, path, (x, y), rect in image_buttons:
-                        if rect.collidepoint(event.pos):
-                            new_bone_data["image_path"] = path
-                            new_bone_data["image"] = pygame.image.load(path).convert_alpha()
-                            menu_state = "add_bone"
-                            break
+                    path = image_picker.handle_click(event.pos)
+                    if path is not None:
+                        new_bone_data["image_path"] = path
+                        new_bone_data["image"] = atlas.get(path)
+                        menu_state = "add_bone"
 
                 if new_menu_state is not None:
                     menu_state = new_menu_state
@@ -173,6 +309,9 @@ while running:
                     else:
                         menu_state = "main"
 
+            if menu_state == "choose_image":
+                image_picker.handle_event(event)
+
             if menu_state == "export":
                 UI.handle_text_input(event, export_selected_input, export_settings)
 
@@ -188,29 +327,28 @@ while running:
                 elif event.button == 1:  # Left-click
                     mx, my = event.pos
                     if play_button_rect.collidepoint(mx, my):
-                        play_mode = not play_mode
+                        playback.toggle()
                     else:
-                        sidebar_x = SCREEN_WIDTH - SIDEBAR_WIDTH
-                        add_bone_rect = pygame.Rect(sidebar_x + 10, y_offset + 10, SIDEBAR_WIDTH - 20, 25)
-                        if add_bone_rect.collidepoint(mx, my):
+                        if bone_list.add_button_rect.collidepoint(mx, my):
                             menu_open = True
                             menu_state = "add_bone"
                             selected_input_field = "name"
-                        elif mx > sidebar_x:
-                            for i, bone in enumerate(bones):
-                                rect = pygame.Rect(sidebar_x + 10, y_offset + 40 + i * 30, SIDEBAR_WIDTH - 20, 25)
-                                if rect.collidepoint(mx, my):
-                                    selected_bone = bone
-                                    break
+                        elif sidebar_rect.collidepoint(mx, my):
+                            picked = bone_list.row_at((mx, my), bones)
+                            if picked is not None:
+                                selected_bone = picked
                         elif my >= TIMELINE_Y + y_offset:
                             scrubbing_timeline = True
                             current_time = min(max(0, mx / (settings.FRAME_WIDTH * FPS)), MAX_TIME)
+                            playback.seek(current_time)
                         else:
-                            for bone in reversed(bones):
-                                if bone.is_clicked((mx, my)):
-                                    selected_bone = bone
-                                    dragging_bone = bone if bone.parent is None else None
-                                    break
+                            bone = bone_grid.pick((mx, my))
+                            if bone is not None:
+                                selected_bone = bone
+                                dragging_bone = bone if bone.parent is None else None
+
+            elif event.type == pygame.MOUSEWHEEL:
+                bone_list.handle_event(event)
 
             elif event.type == pygame.MOUSEBUTTONUP:
                 dragging_bone = None
@@ -220,32 +358,60 @@ while running:
                 mx, my = pygame.mouse.get_pos()
                 if scrubbing_timeline:
                     current_time = min(max(0, mx / (settings.FRAME_WIDTH * FPS)), MAX_TIME)
+                    playback.seek(current_time)
                 elif shift_held and selected_bone:
                     if mouse_prev_pos is not None:
                         dx = mx - mouse_prev_pos[0]
                         dy = my - mouse_prev_pos[1]
                         selected_bone.angle += (dx - dy) * 1.5
                         selected_bone.angle %= 360
+                        autosave.set_angle(selected_bone)
+                        pose_cache.invalidate_angle(selected_bone)
                     mouse_prev_pos = (mx, my)
                 elif dragging_bone and my < TIMELINE_Y + y_offset and mx < SCREEN_WIDTH - SIDEBAR_WIDTH:
                     dragging_bone.x = mx
                     dragging_bone.y = my
+                    autosave.set_position(dragging_bone)
+                    pose_cache.invalidate_all()
+
+                in_viewport = y_offset <= my < TIMELINE_Y + y_offset and mx < SCREEN_WIDTH - SIDEBAR_WIDTH
+                hovered_bone = bone_grid.pick((mx, my)) if in_viewport and not scrubbing_timeline else None
 
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_m:
                     menu_open = not menu_open
                 elif event.key == pygame.K_k and selected_bone:
                     selected_bone.timeline.add_keyframe(current_time, selected_bone.angle)
+                    autosave.add_keyframe(selected_bone, current_time, selected_bone.angle)
+                    pose_cache.invalidate_key(selected_bone, current_time)
+                    keys_version += 1
                     print(f"[KEYFRAME] Added: {selected_bone.name} @ {round(current_time,2)} angle={round(selected_bone.angle,1)}")
                 elif event.key == pygame.K_SPACE:
-                    play_mode = not play_mode
+                    playback.toggle()
+                elif event.key in (pygame.K_LEFTBRACKET, pygame.K_RIGHTBRACKET):
+                    playback.set_speed(playback.speed * (2 if event.key == pygame.K_RIGHTBRACKET else 0.5))
+                    print(f"[PLAYBACK] Speed x{playback.speed:g}")
+                elif event.key == pygame.K_F3:
+                    profiler.toggle()
+                elif event.key == pygame.K_F4:
+                    profiler.dump(settings.PROFILE_DUMP_FILE)
+                elif event.key == pygame.K_r:
+                    playback.every_frame = not playback.every_frame
+                    playback.resync()
+                    print(f"[PLAYBACK] {'Every frame' if playback.every_frame else 'Real time'} ({playback.skipped} frames skipped so far)")
                 elif event.key == pygame.K_DELETE and selected_bone:
+                    for bone in bones:
+                        if bone == selected_bone or bone.parent == selected_bone:
+                            autosave.delete_bone(bone)
                     bones = [b for b in bones if b != selected_bone and b.parent != selected_bone]
                     selected_bone = None
+                    bones_changed()
+                elif event.key == pygame.K_t:
+                    bone_list.toggle_tree_view()
                 elif event.key == pygame.K_s:
-                    saving.save_project(bones)
+                    saving.save_project(bones, atlas=atlas)
                 elif event.key == pygame.K_l:
-                    print("[LOAD] Load function not implemented yet")
+                    load_project()
                 elif event.key == pygame.K_e:
                     export.export_animation_frames()
                 elif event.key in (pygame.K_LSHIFT, pygame.K_RSHIFT):
@@ -253,27 +419,75 @@ while running:
 
     if not shift_held:
         mouse_prev_pos = None
-
-    if play_mode or scrubbing_timeline:
-        update_bone_angles(current_time)
-
-    for bone in bones:
-        if bone.parent is None:
-            bone.update()
-            bone.draw(screen, selected_bone)
-
-    # Draw menus on top if open
-    if menu_open:
-        if menu_state == "main":
-            UI.draw_main_menu(screen, font)
-        elif menu_state == "add_bone":
-            UI.draw_add_bone_menu(screen, new_bone_data, selected_input_field, font)
-        elif menu_state == "choose_image":
-            UI.draw_image_menu(screen, image_buttons, font)
-        elif menu_state == "export":
-            UI.draw_export_menu(screen, export_settings, export_selected_input, font)
-
-    pygame.display.flip()
-    clock.tick(FPS)
-
+    profiler.lap("events")
+
+    with profiler.scope("animate"):
+        posed = False
+        if playback.playing:
+            current_time = playback.advance()
+            posed = pose_at(current_time)
+        elif scrubbing_timeline:
+            posed = pose_at(current_time)
+
+    with profiler.scope("pose"):
+        pose_changed = posed or any(bone.needs_update for bone in roots)
+        # Bones whose joint may have moved, for the picking grid.
+        moved = []
+        for bone in roots:
+            moved += bone.update()
+        if posed:
+            moved = bones
+
+    # --- Work out what changed since the last frame ---
+    dirty.track("topbar", top_bar.active_menu, top_bar.get_rect(SCREEN_WIDTH))
+    dirty.track(
+        "sidebar",
+        (bones_version, selected_bone, bone_list.scroll, bone_list.tree_view),
+        sidebar_rect,
+    )
+    dirty.track("timeline", (current_time, bones_version, keys_version), timeline_rect)
+    dirty.track("play_button", playback.playing, play_button_rect)
+    dirty.track(
+        "context_menu",
+        (context_menu.visible, context_menu.position, context_menu.selected_index),
+        *([context_menu.get_rect()] if context_menu.visible else []),
+    )
+    if dirty.track("bones", (bones_version, selected_bone)) or pose_changed:
+        if bones_rect is not None:
+            dirty.mark(bones_rect)
+        bones_rect = draw_bounds(bones)
+        if bones_rect is not None:
+            dirty.mark(bones_rect)
+        bone_grid.move(moved)
+    dirty.track(
+        "hover",
+        (hovered_bone, (int(hovered_bone.x), int(hovered_bone.y)) if hovered_bone else None),
+        *([hover_rect(hovered_bone)] if hovered_bone else []),
+    )
+    dirty.track(
+        "menu",
+        (menu_open, menu_state, tuple(new_bone_data.values()), tuple(export_settings.values()),
+         selected_input_field, export_selected_input,
+         (image_picker.page, thumbnails.version) if menu_state == "choose_image" else None),
+        *([UI.MENU_AREA_RECT] if menu_open else []),
+    )
+    dirty.track("hud", profiler.hud_lines, *([profiler.hud_rect(hud_origin)] if profiler.hud_lines else []))
+
+    # --- Redraw only the invalidated regions ---
+    rects = dirty.take()
+    for rect in rects:
+        screen.set_clip(rect)
+        draw_scene(rect)
+    screen.set_clip(None)
+    if rects:
+        with profiler.scope("flip"):
+            pygame.display.update(rects)
+    idle = not (rects or playback.playing or scrubbing_timeline or dragging_bone or profiler.enabled)
+    if not idle:
+        clock.tick(FPS)
+    profiler.end_frame()
+
+autosave.stop()
+thumbnails.stop()
+pose_cache.stop()
 pygame.quit()
@@ -0,0 +1,61 @@
+class BoneGrid:
+    """
+    Uniform-grid index of bone joints for viewport picking.
+
+    sync() takes the whole bones list and is meant for when bones are added,
+    removed or loaded; move() re-buckets just the bones whose pose changed
+    (e.g. the ones Bone.update re-solved), so keeping the index current
+    costs as much as the edit, not the rig. pick() looks at the handful of
+    cells around the cursor instead of testing every bone, and resolves
+    overlaps the same way the old `reversed(bones)` scan did: the bone that
+    comes last in the bones list wins.
+    """
+
+    def __init__(self, cell_size=32):
+        self.cell_size = cell_size
+        self._cells = {}
+        self._cell_of = {}
+        self._order = {}
+
+    def _cell(self, bone):
+        return int(bone.x) // self.cell_size, int(bone.y) // self.cell_size
+
+    def _remove(self, bone):
+        cell = self._cell_of.pop(bone)
+        members = self._cells[cell]
+        members.discard(bone)
+        if not members:
+            del self._cells[cell]
+
+    def sync(self, bones):
+        """Bring the index up to date with `bones` and their current joint positions."""
+        self._order = {bone: i for i, bone in enumerate(bones)}
+        for bone in [b for b in self._cell_of if b not in self._order]:
+            self._remove(bone)
+        self.move(bones)
+
+    def move(self, bones):
+        """Re-bucket `bones` (already in the index) at their current joint positions."""
+        for bone in bones:
+            if bone not in self._order:
+                continue
+            cell = self._cell(bone)
+            if self._cell_of.get(bone) != cell:
+                if bone in self._cell_of:
+                    self._remove(bone)
+                self._cells.setdefault(cell, set()).add(bone)
+                self._cell_of[bone] = cell
+
+    def pick(self, pos, radius=10):
+        """Front-most bone whose joint is within `radius` of `pos`, or None."""
+        x, y = pos
+        size = self.cell_size
+        best = None
+        best_order = -1
+        for cx in range(int(x - radius) // size, int(x + radius) // size + 1):
+            for cy in range(int(y - radius) // size, int(y + radius) // size + 1):
+                for bone in self._cells.get((cx, cy), ()):
+                    order = self._order[bone]
+                    if order > best_order and bone.is_clicked(pos, radius):
+                        best, best_order = bone, order
+        return best
@@ -0,0 +1,94 @@
+import time
+
+
+class PlaybackClock:
+    """
+    Drives animation time from a monotonic clock instead of the render loop.
+
+    In real-time mode advance() moves the playhead by the wall-clock time
+    since the previous call (times `speed`), so playback runs at the right
+    speed whatever the render rate; when rendering falls behind, the
+    animation frames in between are skipped (and counted in `skipped`). In
+    every-frame mode each call moves exactly one animation frame, which
+    gives a deterministic, frame-by-frame preview.
+
+    The playhead is always reported on the animation's frame grid
+    (multiples of 1/fps), matching what export renders.
+    """
+
+    def __init__(self, max_time, fps, speed=1.0, loop=True, every_frame=False, clock=time.perf_counter):
+        self.max_time = max_time
+        self.fps = fps
+        self.speed = speed
+        self.loop = loop
+        self.every_frame = every_frame
+        self.playing = False
+        self.skipped = 0
+        self._clock = clock
+        self._position = 0.0  # seconds, not snapped to frames
+        self._frame = 0
+        self._last = None
+
+    @property
+    def time(self):
+        return self._frame / self.fps
+
+    @property
+    def frame_count(self):
+        return max(1, int(self.max_time * self.fps))
+
+    def play(self):
+        if not self.playing:
+            self.playing = True
+            self.resync()
+
+    def pause(self):
+        self.playing = False
+
+    def toggle(self):
+        if self.playing:
+            self.pause()
+        else:
+            self.play()
+
+    def seek(self, time):
+        """Move the playhead (e.g. while scrubbing) without changing play state."""
+        self._position = min(max(0.0, time), self.max_time)
+        self._frame = self._frame_at(self._position)
+        self.resync()
+
+    def resync(self):
+        """Forget the time spent since the last advance() (call after blocking work)."""
+        self._last = self._clock()
+
+    def set_speed(self, speed):
+        self.speed = max(1 / 16, min(16.0, speed))
+
+    def advance(self):
+        """Advance the playhead for one rendered frame and return the new time."""
+        if not self.playing:
+            return self.time
+        now = self._clock()
+        if self.every_frame:
+            self._position += self.speed / self.fps
+        else:
+            self._position += (now - (self._last if self._last is not None else now)) * self.speed
+        self._last = now
+
+        if self._position >= self.max_time:
+            if self.loop and self.max_time > 0:
+                self._position %= self.max_time
+            else:
+                self._position = self.max_time
+                self.playing = False
+
+        frame = self._frame_at(self._position)
+        moved = (frame - self._frame) % self.frame_count if self.loop else frame - self._frame
+        if moved > 1:
+            self.skipped += moved - 1
+        self._frame = frame
+        return self.time
+
+    def _frame_at(self, position):
+        # A small epsilon so positions computed as k / fps land on frame k.
+        return int(position * self.fps + 1e-9)
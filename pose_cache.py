@@ -0,0 +1,203 @@
+import math
+import threading
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+
+from skeleton import Skeleton
+
+
+class _Rig:
+    """
+    What baking reads, copied from the bones on the editor thread: a private
+    copy of every track plus rest angles, lengths and root positions. A rig
+    is never modified once built; edits build a new one, so the baking
+    thread can keep using the one it picked up.
+    """
+
+    def __init__(self, skeleton, tracks=None):
+        timeline_class = type(skeleton.bones[0].timeline) if skeleton.bones else None
+        self.tracks = tracks if tracks is not None else [
+            timeline_class.from_arrays(bone.timeline.times, bone.timeline.angles) for bone in skeleton.bones
+        ]
+        self.defaults = skeleton.local_angles()
+        self.lengths = skeleton.bone_lengths()
+        self.root_positions = skeleton.root_positions()
+
+    def with_track(self, skeleton, index):
+        tracks = list(self.tracks)
+        timeline = skeleton.bones[index].timeline
+        tracks[index] = type(timeline).from_arrays(timeline.times, timeline.angles)
+        return _Rig(skeleton, tracks)
+
+
+class PoseCache:
+    """
+    Baked world transforms for every bone at every frame of the clip.
+
+    Local angles, joint positions and world angles are kept in
+    (frames, bones) float64 arrays, in Skeleton order, and baked by a
+    background thread. Scrubbing and playback apply a baked row instead of
+    sampling every track and re-solving the hierarchy, and export can take
+    whole ranges of rows (see clip()).
+
+    Edits invalidate as little as they can: a new keyframe only changes the
+    interpolation between its neighbouring keys, so only those frames are
+    marked stale and re-baked (the rows are re-solved whole, which is one
+    vectorised pass and covers the edited bone's descendants). Moving a
+    root, or rotating a bone with no keys (its rest angle is used at every
+    frame), invalidates the whole clip. Adding, removing or loading bones
+    needs rebuild(). Frames that aren't baked yet report a miss and the
+    caller evaluates the pose live.
+    """
+
+    def __init__(self, fps, max_time, chunk_frames=256):
+        self.fps = fps
+        self.max_time = max_time
+        self.frame_count = int(round(max_time * fps)) + 1
+        self.chunk_frames = chunk_frames
+        self.skeleton = None
+        self._bones_key = None
+        self._column = {}
+        self._rig = None
+        self._generation = 0  # bumped by rebuild()
+        self._epoch = np.zeros(self.frame_count, dtype=np.int64)  # bumped per invalidation
+        self._valid = np.zeros(self.frame_count, dtype=bool)
+        self._poses = None  # (angles, x, y, global_angle)
+        self._applied = None
+        self._stopping = False
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._thread = threading.Thread(target=self._run, name="pose-bake", daemon=True)
+        self._thread.start()
+
+    # --- Editor thread ---
+
+    def rebuild(self, bones):
+        """Start over for a new bone list or hierarchy."""
+        skeleton = Skeleton(bones)
+        rig = _Rig(skeleton)
+        shape = (self.frame_count, len(skeleton))
+        with self._lock:
+            self.skeleton = skeleton
+            self._bones_key = tuple(bones)
+            self._column = {bone: i for i, bone in enumerate(skeleton.bones)}
+            self._rig = rig
+            self._poses = tuple(np.zeros(shape) for _ in range(4))
+            self._generation += 1
+            self._applied = None
+            self._invalidate(0, self.frame_count)
+
+    def invalidate_key(self, bone, time):
+        """A keyframe at `time` was added to `bone`'s track."""
+        index = self._column.get(bone)
+        if index is None:
+            return
+        times = bone.timeline.times
+        before = bisect_left(times, time)
+        after = bisect_right(times, time)
+        # Outside the first/last key the track is clamped, so the change
+        # reaches the start/end of the clip.
+        start = times[before - 1] if before > 0 else 0.0
+        stop = times[after] if after < len(times) else self.max_time
+        rig = self._rig.with_track(self.skeleton, index)
+        with self._lock:
+            self._rig = rig
+            self._invalidate(math.floor(start * self.fps), math.ceil(stop * self.fps) + 1)
+
+    def invalidate_angle(self, bone):
+        """`bone`'s angle was edited directly (only matters if it has no keys)."""
+        if bone in self._column and not len(bone.timeline):
+            self.invalidate_all()
+
+    def invalidate_all(self):
+        """Root positions, lengths or rest angles changed: re-bake every frame."""
+        if self.skeleton is None:
+            return
+        rig = _Rig(self.skeleton, self._rig.tracks)
+        with self._lock:
+            self._rig = rig
+            self._invalidate(0, self.frame_count)
+
+    def apply(self, time):
+        """
+        Put the baked pose for `time` (nearest frame) onto the bones.
+        Returns None if that frame isn't baked, else whether the bones changed.
+        """
+        frame = min(max(0, int(round(time * self.fps))), self.frame_count - 1)
+        with self._lock:
+            if self.skeleton is None or not self._valid[frame]:
+                return None
+            key = (frame, int(self._epoch[frame]), self._generation)
+            row = [array[frame].copy() for array in self._poses]
+            skeleton = self.skeleton
+        if key == self._applied and not any(bone.needs_update for bone in skeleton.bones):
+            return False
+        skeleton.apply(*row)
+        self._applied = key
+        return True
+
+    def clip(self, bones, frame_indices, fps):
+        """
+        (skeleton, angles, x, y, global_angle) for `frame_indices`, shaped
+        like export.solve_clip_poses' result, or None unless every frame is
+        baked for exactly these bones at this fps.
+        """
+        frames = np.asarray(frame_indices, dtype=np.intp)
+        if fps != self.fps or tuple(bones) != self._bones_key:
+            return None
+        if frames.size and (frames.min() < 0 or frames.max() >= self.frame_count):
+            return None
+        with self._lock:
+            if not self._valid[frames].all():
+                return None
+            return (self.skeleton,) + tuple(array[frames] for array in self._poses)
+
+    @property
+    def baked(self):
+        """Fraction of frames currently baked."""
+        return float(self._valid.mean())
+
+    def stop(self):
+        with self._lock:
+            self._stopping = True
+            self._wake.notify()
+        self._thread.join()
+
+    def _invalidate(self, start, stop):
+        start, stop = max(0, start), min(self.frame_count, stop)
+        if start < stop:
+            self._epoch[start:stop] += 1
+            self._valid[start:stop] = False
+            self._wake.notify()
+
+    # --- Baking thread ---
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._stopping and (self.skeleton is None or self._valid.all()):
+                    self._wake.wait()
+                if self._stopping:
+                    return
+                frames = np.flatnonzero(~self._valid)[:self.chunk_frames]
+                epochs = self._epoch[frames].copy()
+                generation = self._generation
+                skeleton = self.skeleton
+                rig = self._rig
+
+            times = frames / self.fps
+            angles = np.empty((len(frames), len(skeleton)), dtype=np.float64)
+            for i, track in enumerate(rig.tracks):
+                angles[:, i] = track.sample_many(times, default=rig.defaults[i])
+            poses = (angles,) + skeleton.solve_clip(angles, rig.lengths, rig.root_positions)
+
+            with self._lock:
+                if generation != self._generation:
+                    continue
+                # Frames invalidated again while baking stay stale.
+                fresh = self._epoch[frames] == epochs
+                done = frames[fresh]
+                for array, baked in zip(self._poses, poses):
+                    array[done] = baked[fresh]
+                self._valid[done] = True
@@ -0,0 +1,167 @@
+import csv
+import json
+import time
+from collections import deque
+
+import pygame
+
+from fonts import render_text
+
+HUD_BG_COLOR = (0, 0, 0, 170)
+HUD_TEXT_COLOR = (200, 255, 200)
+HUD_LINE_HEIGHT = 16
+
+
+class _NullScope:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SCOPE = _NullScope()
+
+
+class _Scope:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        frame = self.profiler._frame
+        frame[self.name] = frame.get(self.name, 0.0) + time.perf_counter() - self.start
+        return False
+
+
+class FrameProfiler:
+    """
+    Per-stage frame timings for the editor loop.
+
+    Wrap each stage in `with profiler.scope("name"):`, or call lap(name) at
+    the end of a stage that starts the frame; a stage entered more than
+    once in a frame (e.g. drawing each dirty rect) is summed. While
+    disabled, scope() hands back a shared no-op context manager and
+    begin/end_frame return immediately, so the instrumentation can stay in
+    the loop. While enabled, the last `window` frames feed the HUD's rolling
+    averages and p95s, and the last `max_frames` frames are kept for dump().
+    """
+
+    def __init__(self, window=120, hud_refresh=15, max_frames=36000, enabled=False):
+        self.window = window
+        self.hud_refresh = hud_refresh
+        self.enabled = enabled
+        self.stages = []  # in first-seen order, for stable HUD/CSV columns
+        self.frames = deque(maxlen=max_frames)  # (frame start, total seconds, {stage: seconds})
+        self.frame_count = 0
+        self.hud_lines = ()
+        self._recent = deque(maxlen=window)
+        self._scopes = {}
+        self._frame = {}
+        self._frame_start = None
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self._frame_start = None
+        if not self.enabled:
+            self.hud_lines = ()
+
+    def scope(self, name):
+        if not self.enabled:
+            return _NULL_SCOPE
+        scope = self._scopes.get(name)
+        if scope is None:
+            scope = self._scopes[name] = _Scope(self, name)
+            self.stages.append(name)
+        return scope
+
+    def begin_frame(self):
+        if self.enabled:
+            self._frame = {}
+            self._frame_start = time.perf_counter()
+
+    def lap(self, name):
+        """Charge the time since begin_frame() to stage `name`."""
+        if self.enabled and self._frame_start is not None:
+            self.scope(name)
+            self._frame[name] = self._frame.get(name, 0.0) + time.perf_counter() - self._frame_start
+
+    def end_frame(self):
+        """Close the frame. Its total includes time outside scopes (e.g. clock.tick)."""
+        if not self.enabled or self._frame_start is None:
+            return
+        now = time.perf_counter()
+        record = (self._frame_start, now - self._frame_start, self._frame)
+        self.frames.append(record)
+        self._recent.append(record)
+        self.frame_count += 1
+        if self.frame_count % self.hud_refresh == 0 or not self.hud_lines:
+            self.hud_lines = self._summary_lines()
+
+    def stats(self):
+        """{stage: (average ms, p95 ms)} over the rolling window, plus FPS."""
+        if not self._recent:
+            return {}, 0.0
+        result = {}
+        for stage in self.stages:
+            samples = sorted(frame.get(stage, 0.0) * 1000 for _, _, frame in self._recent)
+            result[stage] = (sum(samples) / len(samples), _percentile(samples, 95))
+        elapsed = sum(total for _, total, _ in self._recent)
+        fps = len(self._recent) / elapsed if elapsed > 0 else 0.0
+        return result, fps
+
+    def _summary_lines(self):
+        stats, fps = self.stats()
+        lines = [f"{fps:5.1f} FPS   avg / p95 ms"]
+        for stage, (avg, p95) in stats.items():
+            lines.append(f"{stage:<10} {avg:6.2f} {p95:6.2f}")
+        return tuple(lines)
+
+    def hud_rect(self, origin):
+        width = 190
+        return pygame.Rect(origin[0], origin[1], width, 8 + HUD_LINE_HEIGHT * len(self.hud_lines))
+
+    def draw_hud(self, surface, origin, font):
+        if not self.hud_lines:
+            return
+        rect = self.hud_rect(origin)
+        background = pygame.Surface(rect.size, pygame.SRCALPHA)
+        background.fill(HUD_BG_COLOR)
+        surface.blit(background, rect)
+        for i, line in enumerate(self.hud_lines):
+            surface.blit(render_text(font, line, HUD_TEXT_COLOR), (rect.x + 6, rect.y + 4 + i * HUD_LINE_HEIGHT))
+
+    def dump(self, filename):
+        """Write every recorded frame as CSV, or JSON if `filename` ends in .json."""
+        if filename.endswith(".json"):
+            data = [
+                {"frame": i, "start": start, "total_ms": total * 1000,
+                 "stages_ms": {stage: frame.get(stage, 0.0) * 1000 for stage in self.stages}}
+                for i, (start, total, frame) in enumerate(self.frames)
+            ]
+            with open(filename, "w") as f:
+                json.dump(data, f, indent=4)
+        else:
+            with open(filename, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["frame", "start", "total_ms"] + [f"{stage}_ms" for stage in self.stages])
+                for i, (start, total, frame) in enumerate(self.frames):
+                    writer.writerow(
+                        [i, f"{start:.6f}", f"{total * 1000:.3f}"]
+                        + [f"{frame.get(stage, 0.0) * 1000:.3f}" for stage in self.stages]
+                    )
+        print(f"[PROFILE] Wrote {len(self.frames)} frames to {filename}")
+
+
+def _percentile(sorted_samples, percent):
+    index = min(len(sorted_samples) - 1, int(round(percent / 100 * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
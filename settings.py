@@ -7,4 +7,15 @@ TIMELINE_Y = SCREEN_HEIGHT - TIMELINE_HEIGHT  # timeline height
 MAX_TIME = 5.0
 SAVE_MODE = False
 ASSETS_FOLDER = "assets"
-SIDEBAR_WIDTH = 200
\ No newline at end of file
+SIDEBAR_WIDTH = 200
+ROTATION_CACHE_STEP = 0.5  # degrees; sprite rotations are snapped to this grid
+ROTATION_CACHE_MAX_BYTES = 64 * 1024 * 1024
+ATLAS_PAGE_SIZE = 1024  # pixels per side of a sprite atlas page
+THUMBNAIL_CACHE_FOLDER = ".thumbnails"
+THUMBNAIL_SIZE = (64, 64)
+THUMBNAIL_MEMORY = 64  # thumbnails kept in memory (a few picker pages)
+PROFILE_WINDOW = 120  # frames averaged by the profiler HUD
+PROFILE_DUMP_FILE = "frame_times.csv"  # .json for JSON
+AUTOSAVE_FOLDER = "autosave"
+IDLE_WAIT_MS = 100  # longest the editor sleeps waiting for input when nothing is animating
+AUTOSAVE_INTERVAL = 30.0  # seconds between journal compactions into a full snapshot
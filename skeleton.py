@@ -0,0 +1,109 @@
+from collections import deque
+
+import numpy as np
+
+from bones import SCREEN_WIDTH, SCREEN_HEIGHT
+
+
+class Skeleton:
+    """
+    Flattened view of a bone hierarchy for bulk pose solving.
+
+    The bones reachable from the roots are laid out breadth-first, so every
+    parent comes before its children, and grouped into depth levels. World
+    angles and joint positions are then solved one level at a time with
+    NumPy, either for the current pose or for every frame of a clip at once.
+    No recursion is involved, so arbitrarily long chains are fine.
+    """
+
+    def __init__(self, bones):
+        self.rebuild(bones)
+
+    def rebuild(self, bones):
+        """Re-flatten the hierarchy. Call after bones are added or removed."""
+        order = []
+        parent_index = []
+        depth = []
+        queue = deque((bone, -1, 0) for bone in bones if bone.parent is None)
+        while queue:
+            bone, parent_idx, level = queue.popleft()
+            index = len(order)
+            order.append(bone)
+            parent_index.append(parent_idx)
+            depth.append(level)
+            queue.extend((child, index, level + 1) for child in bone.children)
+
+        self.bones = order
+        self.parent_index = np.array(parent_index, dtype=np.intp)
+        depth = np.array(depth, dtype=np.intp)
+        max_depth = int(depth.max()) if len(order) else 0
+        self.roots = np.flatnonzero(depth == 0)
+        # (indices, parent indices) per level below the roots
+        self.levels = []
+        for level in range(1, max_depth + 1):
+            idx = np.flatnonzero(depth == level)
+            self.levels.append((idx, self.parent_index[idx]))
+
+    def __len__(self):
+        return len(self.bones)
+
+    def local_angles(self):
+        return np.array([bone.angle for bone in self.bones], dtype=np.float64)
+
+    def bone_lengths(self):
+        return np.array([bone.length for bone in self.bones], dtype=np.float64)
+
+    def root_positions(self):
+        roots = [self.bones[i] for i in self.roots]
+        xs = np.array([bone.x or SCREEN_WIDTH // 2 for bone in roots], dtype=np.float64)
+        ys = np.array([bone.y or SCREEN_HEIGHT // 2 for bone in roots], dtype=np.float64)
+        return xs, ys
+
+    def solve_clip(self, angles, lengths=None, root_positions=None):
+        """
+        Solve world transforms for local angles shaped (..., n_bones), in
+        skeleton order. Leading axes (e.g. frames) are broadcast. `lengths`
+        and `root_positions` default to the bones' current values.
+
+        Returns (x, y, global_angle) arrays with the same shape as `angles`.
+        """
+        angles = np.asarray(angles, dtype=np.float64)
+        global_angle = angles.copy()
+        for idx, parents in self.levels:
+            global_angle[..., idx] += global_angle[..., parents]
+
+        rad = np.radians(global_angle)
+        if lengths is None:
+            lengths = self.bone_lengths()
+        dx = lengths * np.cos(rad)
+        dy = lengths * np.sin(rad)
+
+        x = np.empty_like(angles)
+        y = np.empty_like(angles)
+        root_x, root_y = self.root_positions() if root_positions is None else root_positions
+        x[..., self.roots] = root_x
+        y[..., self.roots] = root_y
+        for idx, parents in self.levels:
+            x[..., idx] = x[..., parents] + dx[..., parents]
+            y[..., idx] = y[..., parents] + dy[..., parents]
+        return x, y, global_angle
+
+    def sample_clip(self, times):
+        """Local angles for every bone at every time, shaped (len(times), n_bones)."""
+        times = np.asarray(times, dtype=np.float64)
+        angles = np.empty((len(times), len(self.bones)), dtype=np.float64)
+        for i, bone in enumerate(self.bones):
+            angles[:, i] = bone.timeline.sample_many(times, default=bone.angle)
+        return angles
+
+    def apply(self, angles, x, y, global_angle):
+        """Write one solved pose (1-D arrays in skeleton order) back onto the bones."""
+        for bone, a, bx, by, ga in zip(
+            self.bones, angles.tolist(), x.tolist(), y.tolist(), global_angle.tolist()
+        ):
+            bone.set_pose(a, bx, by, ga)
+
+    def solve(self):
+        """Solve the bones' current local pose and store the result on them."""
+        angles = self.local_angles()
+        self.apply(angles, *self.solve_clip(angles))
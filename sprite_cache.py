@@ -0,0 +1,87 @@
+import pygame
+from collections import OrderedDict
+
+import settings
+
+
+class RotationCache:
+    """
+    LRU cache of rotated sprite surfaces keyed by (image, quantized angle).
+
+    Angles are snapped to multiples of `step` degrees, so a static pose or a
+    looping clip stops allocating new surfaces once every angle it visits has
+    been rotated once. The cache is bounded by the total pixel bytes it holds
+    rather than by entry count, since sprite sizes vary a lot.
+    """
+
+    def __init__(self, step=settings.ROTATION_CACHE_STEP, max_bytes=settings.ROTATION_CACHE_MAX_BYTES):
+        self.step = step
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._surfaces = OrderedDict()
+
+    def quantize(self, angle):
+        if self.step <= 0:
+            return angle % 360
+        return (round(angle / self.step) * self.step) % 360
+
+    def rotate(self, image, angle, exact=False):
+        """
+        Rotate `image` by `angle` degrees (pygame convention, counterclockwise).
+        exact=True bypasses the cache and rotates by the exact angle.
+        """
+        if exact:
+            return pygame.transform.rotate(image, angle)
+
+        key = (image, self.quantize(angle))
+        rotated = self._surfaces.get(key)
+        if rotated is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return rotated
+
+        self.misses += 1
+        rotated = pygame.transform.rotate(image, key[1])
+        size = _surface_bytes(rotated)
+        if size > self.max_bytes:
+            return rotated
+        self._surfaces[key] = rotated
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, evicted = self._surfaces.popitem(last=False)
+            self.bytes -= _surface_bytes(evicted)
+        return rotated
+
+    def discard(self, image):
+        """Drop every cached rotation of `image` (e.g. after it was edited or replaced)."""
+        for key in [k for k in self._surfaces if k[0] is image]:
+            self.bytes -= _surface_bytes(self._surfaces.pop(key))
+
+    def clear(self):
+        self._surfaces.clear()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._surfaces),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+def _surface_bytes(surface):
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+rotation_cache = RotationCache()
+
+
+def rotate_sprite(image, angle, exact=False):
+    """Rotate through the shared rotation cache."""
+    return rotation_cache.rotate(image, angle, exact)
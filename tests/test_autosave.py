@@ -0,0 +1,109 @@
+import os
+import shutil
+import time
+
+import pytest
+
+import saving
+from autosave import JOURNAL_NAME, Autosave, recover
+from bones import Bone
+from timeline import Timeline
+
+
+def journal_lines(folder):
+    path = os.path.join(folder, JOURNAL_NAME)
+    if not os.path.isfile(path):
+        return []
+    with open(path) as f:
+        return f.read().splitlines()
+
+
+def wait_for_lines(folder, count, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while len(journal_lines(folder)) < count:
+        assert time.monotonic() < deadline, "journal never caught up"
+        time.sleep(0.01)
+
+
+def snapshots(folder):
+    return sorted(name for name in os.listdir(folder) if name.startswith("snapshot-"))
+
+
+def describe(bones):
+    index = {bone: i for i, bone in enumerate(bones)}
+    return [
+        (bone.name, bone.length, bone.angle, bone.x, bone.y, index.get(bone.parent),
+         list(bone.timeline.times), list(bone.timeline.angles))
+        for bone in bones
+    ]
+
+
+@pytest.fixture
+def session(tmp_path):
+    """An autosave that has journaled a few edits on top of its first snapshot."""
+    folder = str(tmp_path / "autosave")
+    autosave = Autosave(folder=folder, interval=3600)
+    root = Bone("", 40, Timeline())
+    root.x, root.y = 100, 120
+    autosave.start([root])
+    wait_for_lines(folder, 1)
+
+    child = Bone("", 25, Timeline(), parent=root)
+    autosave.add_bone(child)
+    child.timeline.add_keyframe(0.5, 30.0)
+    autosave.add_keyframe(child, 0.5, 30.0)
+    root.angle = 15
+    autosave.set_angle(root)
+    root.x = 140
+    autosave.set_position(root)
+    wait_for_lines(folder, 5)
+    yield autosave, folder, [root, child]
+    autosave.stop()
+
+
+def test_snapshots_use_the_binary_format(session):
+    _, folder, _ = session
+    names = snapshots(folder)
+    assert names == ["snapshot-1" + saving.BINARY_EXTENSION]
+    with open(os.path.join(folder, names[0]), "rb") as f:
+        assert f.read(len(saving.BINARY_MAGIC)) == saving.BINARY_MAGIC
+
+
+def test_recover_replays_the_journal(session, tmp_path):
+    _, folder, bones = session
+    crashed = str(tmp_path / "crashed")
+    shutil.copytree(folder, crashed)
+    recovered = recover(Bone, Timeline, folder=crashed)
+    assert describe(recovered) == describe(bones)
+    assert recovered[0].children == [recovered[1]]
+
+
+def test_recover_ignores_a_torn_final_line(session, tmp_path):
+    _, folder, bones = session
+    crashed = str(tmp_path / "crashed")
+    shutil.copytree(folder, crashed)
+    with open(os.path.join(crashed, JOURNAL_NAME), "a") as f:
+        f.write('{"op": "set_angle", "id": 0, "ang')
+    assert describe(recover(Bone, Timeline, folder=crashed)) == describe(bones)
+
+
+def test_stop_compacts_into_a_new_snapshot(session):
+    autosave, folder, bones = session
+    autosave.stop()
+    assert snapshots(folder) == ["snapshot-2" + saving.BINARY_EXTENSION]
+    assert len(journal_lines(folder)) == 1
+    assert describe(recover(Bone, Timeline, folder=folder)) == describe(bones)
+
+
+def test_delete_detaches_children(session, tmp_path):
+    autosave, folder, (root, child) = session
+    autosave.delete_bone(root)
+    wait_for_lines(folder, 6)
+    crashed = str(tmp_path / "crashed")
+    shutil.copytree(folder, crashed)
+    (recovered,) = recover(Bone, Timeline, folder=crashed)
+    assert recovered.parent is None and recovered.length == child.length
+
+
+def test_nothing_to_recover(tmp_path):
+    assert recover(Bone, Timeline, folder=str(tmp_path)) == []
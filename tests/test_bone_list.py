@@ -0,0 +1,56 @@
+import pygame
+
+import UI
+from bones import Bone
+from timeline import Timeline
+
+SIDEBAR = pygame.Rect(600, 30, 200, 450)
+
+
+def row_centre(bone_list, index):
+    return bone_list.list_rect.x + 60, bone_list.list_rect.y + index * UI.SIDEBAR_ROW_HEIGHT + 5
+
+
+def listed(bone_list, bones):
+    rows = [bone_list.row_at(row_centre(bone_list, i), bones) for i in range(len(bones) + 1)]
+    assert rows[-1] is None
+    return rows[:-1]
+
+
+def make_bones():
+    root = Bone("root", 10, Timeline())
+    other = Bone("other", 10, Timeline())
+    child = Bone("child", 10, Timeline(), parent=root)
+    return [root, other, child]
+
+
+def test_flat_order_by_default_and_tree_on_toggle():
+    bones = make_bones()
+    root, other, child = bones
+    bone_list = UI.BoneList(SIDEBAR)
+    assert not bone_list.tree_view
+    assert listed(bone_list, bones) == [root, other, child]
+    bone_list.toggle_tree_view()
+    assert listed(bone_list, bones) == [root, child, other]
+
+
+def test_rows_are_reused_until_invalidated():
+    bones = make_bones()
+    bone_list = UI.BoneList(SIDEBAR)
+    listed(bone_list, bones)
+    added = Bone("added", 10, Timeline())
+    bones.append(added)
+    assert bone_list.row_at(row_centre(bone_list, 3), bones) is None
+    bone_list.invalidate()
+    assert bone_list.row_at(row_centre(bone_list, 3), bones) is added
+
+
+def test_gaps_and_scrolling():
+    bones = [Bone(f"b{i}", 10, Timeline()) for i in range(40)]
+    bone_list = UI.BoneList(SIDEBAR)
+    x, y = row_centre(bone_list, 0)
+    assert bone_list.row_at((x, y + UI.SIDEBAR_BUTTON_HEIGHT - 3), bones) is None  # between buttons
+    bone_list.scroll_by(3)
+    assert bone_list.row_at((x, y), bones) is bones[3]
+    bone_list.scroll_by(1000)
+    assert bone_list.scroll == 40 * UI.SIDEBAR_ROW_HEIGHT - bone_list.list_rect.height
@@ -0,0 +1,68 @@
+import pytest
+
+from bones import Bone
+from timeline import Timeline
+
+
+def make_rig():
+    """root -> (arm -> hand -> finger, leg -> foot), all solved and clean."""
+    root = Bone("root", 10, Timeline())
+    root.x, root.y = 100, 100
+    arm = Bone("arm", 20, Timeline(), angle=30, parent=root)
+    hand = Bone("hand", 10, Timeline(), angle=-15, parent=arm)
+    finger = Bone("finger", 5, Timeline(), angle=5, parent=hand)
+    leg = Bone("leg", 30, Timeline(), angle=90, parent=root)
+    foot = Bone("foot", 8, Timeline(), angle=10, parent=leg)
+    root.update()
+    return root, arm, hand, finger, leg, foot
+
+
+def test_update_leaves_everything_clean():
+    for bone in make_rig():
+        assert not bone.needs_update
+
+
+def test_invalidation_flags_ancestors_only():
+    root, arm, hand, finger, leg, foot = make_rig()
+    finger.angle = 45
+    assert finger._dirty
+    assert hand._dirty_below and arm._dirty_below and root._dirty_below
+    assert not (hand._dirty or arm._dirty or root._dirty)
+    assert not leg.needs_update and not foot.needs_update
+
+
+def test_setting_the_same_value_does_not_invalidate():
+    root, arm, *_ = make_rig()
+    arm.angle = arm.angle
+    arm.length = arm.length
+    root.x = root.x
+    assert not root.needs_update
+
+
+def test_update_only_moves_the_edited_subtree():
+    root, arm, hand, finger, leg, foot = make_rig()
+    before = {bone: (bone.x, bone.y, bone.global_angle) for bone in (root, arm, leg, foot)}
+    old_finger = (finger.x, finger.y)
+    hand.angle += 20
+    root.update()
+    assert {bone: (bone.x, bone.y, bone.global_angle) for bone in before} == before
+    assert (finger.x, finger.y) != pytest.approx(old_finger)
+    assert finger.global_angle == pytest.approx(30 + (-15 + 20) + 5)
+    assert not root.needs_update
+
+
+def test_moving_the_root_moves_every_bone():
+    root, arm, hand, finger, leg, foot = make_rig()
+    before = {bone: (bone.x, bone.y) for bone in (arm, hand, finger, leg, foot)}
+    root.x += 7
+    root.update()
+    for bone, (x, y) in before.items():
+        assert (bone.x, bone.y) == pytest.approx((x + 7, y))
+
+
+def test_set_pose_marks_bone_clean():
+    root, arm, *_ = make_rig()
+    arm.angle = 60
+    arm.set_pose(60, 1.0, 2.0, 3.0)
+    assert not arm._dirty and not arm._dirty_below
+    assert (arm.x, arm.y, arm.global_angle) == (1.0, 2.0, 3.0)
@@ -0,0 +1,76 @@
+import random
+
+from bones import Bone
+from picking import BoneGrid
+from timeline import Timeline
+
+
+def make_bone(x, y, length=10):
+    bone = Bone("", length, Timeline())
+    bone.x, bone.y = x, y
+    return bone
+
+
+def linear_pick(bones, pos, radius=10):
+    """The old scan: last bone in the list under the cursor wins."""
+    for bone in reversed(bones):
+        if bone.is_clicked(pos, radius):
+            return bone
+    return None
+
+
+def test_later_bone_wins_overlaps():
+    a, b, c = make_bone(100, 100), make_bone(104, 100), make_bone(300, 300)
+    grid = BoneGrid()
+    grid.sync([a, b, c])
+    assert grid.pick((102, 100)) is b
+    grid.sync([b, a, c])
+    assert grid.pick((102, 100)) is a
+    assert grid.pick((300, 309)) is c
+    assert grid.pick((300, 311)) is None
+
+
+def test_matches_linear_scan_across_cell_borders():
+    rng = random.Random(3)
+    bones = [make_bone(rng.uniform(0, 400), rng.uniform(0, 300)) for _ in range(300)]
+    grid = BoneGrid(cell_size=32)
+    grid.sync(bones)
+    for _ in range(2000):
+        pos = (rng.uniform(-20, 420), rng.uniform(-20, 320))
+        assert grid.pick(pos) is linear_pick(bones, pos)
+
+
+def test_sync_drops_removed_bones():
+    a, b = make_bone(50, 50), make_bone(50, 50)
+    grid = BoneGrid()
+    grid.sync([a, b])
+    grid.sync([a])
+    assert grid.pick((50, 50)) is a
+    grid.sync([])
+    assert grid.pick((50, 50)) is None
+
+
+def test_move_follows_the_bones_update_solved():
+    root = make_bone(100, 100, length=50)
+    arm = Bone("", 20, Timeline(), parent=root)
+    hand = Bone("", 10, Timeline(), parent=arm)
+    other = make_bone(400, 400)
+    bones = [root, arm, hand, other]
+    grid = BoneGrid()
+    grid.sync(bones)
+    grid.move(root.update() + other.update())
+    assert grid.pick((150, 100)) is arm
+    assert grid.pick((170, 100)) is hand
+
+    hand.angle = 45
+    assert other.update() == []
+    assert root.update() == [hand]
+
+    root.angle = 90
+    solved = root.update()
+    assert set(solved) == {root, arm, hand}
+    grid.move(solved)
+    assert grid.pick((150, 100)) is None
+    assert grid.pick((100, 150)) is arm
+    assert grid.pick((100, 170)) is hand
+    assert grid.pick((400, 400)) is other
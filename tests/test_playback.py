@@ -0,0 +1,102 @@
+import pytest
+
+from playback import PlaybackClock
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_clock(**kwargs):
+    fake = FakeClock()
+    return PlaybackClock(2.0, 10, clock=fake, **kwargs), fake
+
+
+def test_paused_clock_does_not_move():
+    clock, fake = make_clock()
+    fake.now += 5
+    assert clock.advance() == 0.0
+
+
+def test_real_time_follows_wall_clock_on_the_frame_grid():
+    clock, fake = make_clock()
+    clock.play()
+    fake.now += 0.35
+    assert clock.advance() == pytest.approx(0.3)
+    fake.now += 0.05
+    assert clock.advance() == pytest.approx(0.4)
+
+
+def test_slow_frames_skip_animation_frames():
+    clock, fake = make_clock()
+    clock.play()
+    fake.now += 0.1
+    clock.advance()
+    assert clock.skipped == 0
+    fake.now += 0.5  # one render frame took five animation frames
+    assert clock.advance() == pytest.approx(0.6)
+    assert clock.skipped == 4
+
+
+def test_loops_and_counts_skips_across_the_wrap():
+    clock, fake = make_clock()
+    clock.play()
+    fake.now += 1.9
+    clock.advance()
+    skipped = clock.skipped
+    fake.now += 0.3
+    assert clock.advance() == pytest.approx(0.2)
+    assert clock.playing
+    assert clock.skipped - skipped == 2
+
+
+def test_stops_at_the_end_without_loop():
+    clock, fake = make_clock(loop=False)
+    clock.play()
+    fake.now += 5
+    assert clock.advance() == pytest.approx(2.0)
+    assert not clock.playing
+
+
+def test_every_frame_mode_ignores_wall_clock():
+    clock, fake = make_clock(every_frame=True)
+    clock.play()
+    for frame in range(1, 6):
+        fake.now += 3
+        assert clock.advance() == pytest.approx(frame / 10)
+    assert clock.skipped == 0
+
+
+@pytest.mark.parametrize("requested, expected", [(0.0, 1 / 16), (0.5, 0.5), (4.0, 4.0), (100.0, 16.0)])
+def test_speed_is_clamped(requested, expected):
+    clock, _ = make_clock()
+    clock.set_speed(requested)
+    assert clock.speed == expected
+
+
+def test_speed_scales_real_time():
+    clock, fake = make_clock()
+    clock.set_speed(2.0)
+    clock.play()
+    fake.now += 0.25
+    assert clock.advance() == pytest.approx(0.5)
+
+
+def test_seek_and_resync_drop_elapsed_time():
+    clock, fake = make_clock()
+    clock.play()
+    fake.now += 10  # e.g. blocked in an export
+    clock.seek(1.23)
+    assert clock.time == pytest.approx(1.2)
+    assert clock.advance() == pytest.approx(1.2)
+    fake.now += 10
+    clock.resync()
+    assert clock.advance() == pytest.approx(1.2)
+    clock.seek(-3)
+    assert clock.time == 0.0
+    clock.seek(99)
+    assert clock.time == pytest.approx(2.0)
@@ -0,0 +1,106 @@
+import time
+
+import numpy as np
+import pytest
+
+import export
+from bones import Bone
+from pose_cache import PoseCache
+from timeline import Timeline
+
+FPS = 10
+MAX_TIME = 2.0
+FRAMES = list(range(int(MAX_TIME * FPS) + 1))
+
+
+def make_rig():
+    root = Bone("root", 40, Timeline.from_arrays([0.5, 1.0, 1.5], [0.0, 90.0, 45.0]))
+    root.x, root.y = 300, 200
+    arm = Bone("arm", 30, Timeline.from_arrays([0.0, 2.0], [-30.0, 60.0]), parent=root)
+    hand = Bone("hand", 10, Timeline(), angle=20, parent=arm)
+    return [root, arm, hand]
+
+
+def wait_until_baked(cache, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while cache.baked < 1.0:
+        assert time.monotonic() < deadline, "pose cache never finished baking"
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def cache():
+    cache = PoseCache(FPS, MAX_TIME)
+    yield cache
+    cache.stop()
+
+
+def assert_matches_live_solve(cache, bones):
+    cached = cache.clip(bones, FRAMES, FPS)
+    assert cached is not None
+    expected = export.solve_clip_poses(bones, FRAMES, FPS)
+    assert cached[0].bones == expected[0].bones
+    for baked, live in zip(cached[1:], expected[1:]):
+        assert np.allclose(baked, live)
+
+
+def test_baked_poses_match_the_live_solve(cache):
+    bones = make_rig()
+    assert cache.apply(0.5) is None  # nothing to apply before rebuild()
+    cache.rebuild(bones)
+    wait_until_baked(cache)
+    assert_matches_live_solve(cache, bones)
+
+
+def test_clip_refuses_other_bones_or_fps(cache):
+    bones = make_rig()
+    cache.rebuild(bones)
+    wait_until_baked(cache)
+    assert cache.clip(bones[:2], FRAMES, FPS) is None
+    assert cache.clip(bones, FRAMES, FPS * 2) is None
+    assert cache.clip(bones, [len(FRAMES)], FPS) is None
+
+
+def test_apply_poses_the_bones(cache):
+    bones = make_rig()
+    cache.rebuild(bones)
+    wait_until_baked(cache)
+    assert cache.apply(1.0) is True
+    root, arm, hand = bones
+    assert root.angle == pytest.approx(90.0)
+    assert (arm.x, arm.y) == pytest.approx((300.0, 240.0))
+    assert not any(bone.needs_update for bone in bones)
+    assert cache.apply(1.0) is False  # same frame, bones untouched
+
+
+@pytest.mark.parametrize("key_time, first, last", [
+    (1.2, 10, 15),  # between the keys at 1.0 and 1.5
+    (0.2, 0, 5),  # before the first key: the clamped start of the clip too
+    (1.8, 15, 20),  # after the last key: through the end of the clip
+    (1.0, 5, 15),  # on an existing key: both neighbouring segments
+])
+def test_invalidate_key_covers_only_the_neighbouring_keys(cache, key_time, first, last):
+    bones = make_rig()
+    root = bones[0]
+    cache.rebuild(bones)
+    wait_until_baked(cache)
+    before = cache._epoch.copy()
+    root.timeline.add_keyframe(key_time, -120.0)
+    cache.invalidate_key(root, key_time)
+    touched = np.flatnonzero(cache._epoch != before).tolist()
+    assert touched == list(range(first, last + 1))
+    wait_until_baked(cache)
+    assert_matches_live_solve(cache, bones)
+
+
+def test_rest_angle_edit_rebakes_everything(cache):
+    bones = make_rig()
+    hand = bones[2]
+    cache.rebuild(bones)
+    wait_until_baked(cache)
+    before = cache._epoch.copy()
+    hand.angle = 70
+    cache.invalidate_angle(hand)
+    assert (cache._epoch != before).all()
+    wait_until_baked(cache)
+    assert_matches_live_solve(cache, bones)
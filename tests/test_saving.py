@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+import saving
+from bones import Bone
+from timeline import Timeline
+
+
+def make_rig():
+    """Unnamed root, two bones sharing a name, children under each."""
+    root = Bone("", 40, Timeline.from_arrays([0.0, 1.5], [0.0, 90.0]), angle=5)
+    root.x, root.y = 120, 80
+    left = Bone("x", 30, Timeline.from_arrays([0.25], [-45.0]), parent=root)
+    right = Bone("x", 35, Timeline(), angle=12.5, parent=root)
+    tip = Bone("", 10, Timeline.from_arrays([0.0, 0.5, 0.5, 2.0], [1.0, 2.0, 3.0, 4.0]), parent=left)
+    foot = Bone("foot", 20, Timeline(), parent=right, image_path="assets/foot.png")
+    return [root, left, right, tip, foot]
+
+
+def describe(bones):
+    index = {bone: i for i, bone in enumerate(bones)}
+    return [
+        (bone.name, bone.length, bone.angle, bone.x, bone.y, index.get(bone.parent),
+         [index[child] for child in bone.children], bone.image_path,
+         list(bone.timeline.times), list(bone.timeline.angles))
+        for bone in bones
+    ]
+
+
+def load(path):
+    return saving.load_project([], path, bone_class=Bone, timeline_class=Timeline, load_images=False)
+
+
+@pytest.mark.parametrize("filename", ["project.json", "project" + saving.BINARY_EXTENSION])
+def test_round_trip_keeps_hierarchy(tmp_path, filename):
+    bones = make_rig()
+    path = str(tmp_path / filename)
+    saving.save_project(bones, path)
+    assert describe(load(path)) == describe(bones)
+
+
+def test_json_stores_parent_index(tmp_path):
+    path = tmp_path / "project.json"
+    saving.save_project(make_rig(), str(path))
+    data = json.loads(path.read_text())
+    assert [bone["parent_index"] for bone in data] == [None, 0, 0, 1, 2]
+
+
+def test_json_without_parent_index_falls_back_to_names(tmp_path):
+    path = tmp_path / "old.json"
+    data = [
+        {"name": "root", "length": 10, "parent": None, "timeline": []},
+        {"name": "arm", "length": 10, "parent": "root", "timeline": [{"time": 1.0, "angle": 2.0}]},
+        {"name": "hand", "length": 10, "parent": "arm", "timeline": []},
+    ]
+    path.write_text(json.dumps(data))
+    root, arm, hand = load(str(path))
+    assert hand.parent is arm and arm.parent is root and root.parent is None
+    assert root.children == [arm] and arm.children == [hand]
+
+
+def test_convert_between_formats(tmp_path):
+    bones = make_rig()
+    source = str(tmp_path / "project.json")
+    binary = str(tmp_path / ("project" + saving.BINARY_EXTENSION))
+    back = str(tmp_path / "back.json")
+    saving.save_project(bones, source)
+    saving.convert_project(source, binary)
+    saving.convert_project(binary, back)
+    with open(binary, "rb") as f:
+        assert f.read(len(saving.BINARY_MAGIC)) == saving.BINARY_MAGIC
+    assert describe(load(back)) == describe(bones)
+
+
+def test_truncated_binary_is_rejected(tmp_path):
+    path = tmp_path / ("project" + saving.BINARY_EXTENSION)
+    saving.save_project(make_rig(), str(path))
+    data = path.read_bytes()
+    path.write_bytes(data[:-8])
+    with pytest.raises(ValueError):
+        saving.read_records(str(path), Timeline)
@@ -0,0 +1,96 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+from bones import Bone
+from skeleton import Skeleton
+from timeline import Timeline
+
+
+def make_tree(count, seed=0):
+    rng = random.Random(seed)
+    bones = []
+    for i in range(count):
+        parent = rng.choice(bones) if bones and rng.random() < 0.9 else None
+        bone = Bone(f"b{i}", rng.uniform(5, 50), Timeline(), angle=rng.uniform(-180, 180), parent=parent)
+        if parent is None:
+            bone.x, bone.y = rng.uniform(0, 800), rng.uniform(0, 600)
+        bones.append(bone)
+    return bones
+
+
+def reference_pose(bones):
+    """World (x, y, global_angle) per bone, solved recursively from the roots."""
+    pose = {}
+
+    def solve(bone, x, y, parent_angle):
+        global_angle = parent_angle + bone.angle
+        pose[bone] = (x, y, global_angle)
+        rad = math.radians(global_angle)
+        for child in bone.children:
+            solve(child, x + bone.length * math.cos(rad), y + bone.length * math.sin(rad), global_angle)
+
+    for bone in bones:
+        if bone.parent is None:
+            solve(bone, bone.x, bone.y, 0.0)
+    return pose
+
+
+def current_pose(bones):
+    return {bone: (bone.x, bone.y, bone.global_angle) for bone in bones}
+
+
+def assert_poses_equal(actual, expected):
+    assert actual.keys() == expected.keys()
+    for bone, values in expected.items():
+        assert actual[bone] == pytest.approx(values)
+
+
+def test_breadth_first_order_puts_parents_first():
+    bones = make_tree(60)
+    skeleton = Skeleton(bones)
+    assert sorted(map(id, skeleton.bones)) == sorted(map(id, bones))
+    position = {bone: i for i, bone in enumerate(skeleton.bones)}
+    for bone, parent in zip(skeleton.bones, skeleton.parent_index):
+        assert parent == (-1 if bone.parent is None else position[bone.parent])
+        assert parent < position[bone]
+
+
+def test_solve_matches_bone_update_and_reference():
+    bones = make_tree(80, seed=1)
+    expected = reference_pose(bones)
+
+    for bone in bones:
+        if bone.parent is None:
+            bone.update()
+    assert_poses_equal(current_pose(bones), expected)
+
+    for bone in bones:
+        bone.invalidate()
+    Skeleton(bones).solve()
+    assert_poses_equal(current_pose(bones), expected)
+    assert not any(bone.needs_update for bone in bones)
+
+
+def test_solve_clip_broadcasts_over_frames():
+    bones = make_tree(30, seed=2)
+    skeleton = Skeleton(bones)
+    rng = np.random.default_rng(0)
+    angles = rng.uniform(-180, 180, size=(5, len(skeleton)))
+    x, y, global_angle = skeleton.solve_clip(angles)
+    assert x.shape == y.shape == global_angle.shape == angles.shape
+    for frame in range(len(angles)):
+        fx, fy, fg = skeleton.solve_clip(angles[frame])
+        assert np.allclose(x[frame], fx) and np.allclose(y[frame], fy) and np.allclose(global_angle[frame], fg)
+
+
+def test_long_chain_has_no_recursion_limit():
+    bones = [Bone("root", 1, Timeline())]
+    for i in range(5000):
+        bones.append(Bone(f"b{i}", 1, Timeline(), parent=bones[-1]))
+    bones[0].update()
+    assert bones[-1].x == pytest.approx(bones[0].x + 5000)
+    Skeleton(bones).solve()
+    assert bones[-1].x == pytest.approx(bones[0].x + 5000)
@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from timeline import Timeline
+
+
+def linear_angle_at(keys, time, default=None):
+    """Reference lookup: scan the sorted (time, angle) keys from the start."""
+    if not keys:
+        return default if default is not None else 0
+    if len(keys) == 1 or time <= keys[0][0]:
+        return keys[0][1]
+    if time > keys[-1][0]:
+        return keys[-1][1]
+    for (t0, a0), (t1, a1) in zip(keys, keys[1:]):
+        if t0 < time <= t1:
+            t = (time - t0) / (t1 - t0)
+            return a0 * (1 - t) + a1 * t
+
+
+def make_track(rng, count):
+    timeline = Timeline()
+    keys = []
+    for _ in range(count):
+        time, angle = round(rng.uniform(0, 10), 2), rng.uniform(-180, 180)
+        timeline.add_keyframe(time, angle)
+        keys.append((time, angle))
+    keys.sort(key=lambda key: key[0])  # stable, like add_keyframe
+    return timeline, keys
+
+
+def test_keys_stay_sorted_with_ties_in_insertion_order():
+    timeline = Timeline()
+    for time, angle in [(2.0, 20.0), (1.0, 10.0), (2.0, 21.0), (0.5, 5.0), (2.0, 22.0)]:
+        timeline.add_keyframe(time, angle)
+    assert list(timeline.times) == [0.5, 1.0, 2.0, 2.0, 2.0]
+    assert list(timeline.angles) == [5.0, 10.0, 20.0, 21.0, 22.0]
+    assert [k.angle for k in timeline.keyframes] == list(timeline.angles)
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 17, 200])
+def test_lookup_matches_linear_reference_in_any_order(count):
+    rng = random.Random(count)
+    timeline, keys = make_track(rng, count)
+    forward = [i * 0.01 for i in range(-50, 1100)]
+    for time in forward + rng.sample(forward, len(forward)) + forward[::-1]:
+        assert timeline.get_angle_at(time) == pytest.approx(linear_angle_at(keys, time))
+
+
+def test_hint_is_not_stale_after_insert():
+    timeline = Timeline()
+    timeline.add_keyframe(0.0, 0.0)
+    timeline.add_keyframe(10.0, 100.0)
+    assert timeline.get_angle_at(5.0) == pytest.approx(50.0)
+    timeline.add_keyframe(4.0, 0.0)
+    assert timeline.get_angle_at(5.0) == pytest.approx(100.0 / 6)
+
+
+def test_empty_track_uses_default():
+    timeline = Timeline()
+    assert timeline.get_angle_at(1.0) == 0
+    assert timeline.get_angle_at(1.0, default=33.0) == 33.0
+
+
+def test_from_arrays_copies_and_bumps_version():
+    times, angles = [0.0, 1.0], [0.0, 90.0]
+    timeline = Timeline.from_arrays(times, angles)
+    times[1] = 5.0
+    assert list(timeline.times) == [0.0, 1.0]
+    assert timeline.version > 0
+    with pytest.raises(ValueError):
+        Timeline.from_arrays([0.0, 1.0], [0.0])
+
+
+@pytest.mark.parametrize("count", [0, 1, 2, 50])
+def test_sample_many_matches_get_angle_at(count):
+    rng = random.Random(100 + count)
+    timeline, _ = make_track(rng, count)
+    times = [i * 0.013 for i in range(-40, 900)] + list(timeline.times)
+    expected = [timeline.get_angle_at(t, default=12.5) for t in times]
+    assert timeline.sample_many(times, default=12.5).tolist() == pytest.approx(expected)
+
+
+def test_sample_many_keeps_shape():
+    timeline = Timeline.from_arrays([0.0, 1.0], [0.0, 10.0])
+    result = timeline.sample_many([[0.0, 0.5], [1.0, 2.0]])
+    assert result.shape == (2, 2)
+    assert result.tolist() == [[0.0, 5.0], [10.0, 10.0]]
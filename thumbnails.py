@@ -0,0 +1,113 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict, deque
+
+import pygame
+
+import settings
+
+
+class ThumbnailCache:
+    """
+    Image thumbnails made on a worker thread and kept in an on-disk cache.
+
+    get() never blocks: it returns a thumbnail that's ready, or None (and
+    queues the image) so the caller can draw a placeholder. The most
+    recently requested images are made first, so the page the user is
+    looking at wins over pages they've already scrolled past. Made
+    thumbnails are written to `cache_folder` under a key of path, mtime and
+    file size, so later launches read a 64x64 PNG instead of decoding and
+    scaling the full image, and an edited image gets a fresh thumbnail.
+    Only the `max_in_memory` most recently used thumbnails stay in memory.
+    """
+
+    def __init__(self, cache_folder=settings.THUMBNAIL_CACHE_FOLDER, size=settings.THUMBNAIL_SIZE,
+                 max_in_memory=settings.THUMBNAIL_MEMORY):
+        self.cache_folder = cache_folder
+        self.size = tuple(size)
+        self.max_in_memory = max_in_memory
+        # Bumped whenever a requested thumbnail becomes ready, so views can
+        # tell when to redraw.
+        self.version = 0
+        self._thumbnails = OrderedDict()  # path -> converted Surface (editor thread only)
+        self._ready = {}  # path -> Surface or None (failed), handed over by the worker
+        self._pending = deque()
+        self._queued = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="thumbnails", daemon=True)
+        self._thread.start()
+
+    def get(self, path):
+        """The thumbnail Surface for `path`, or None if it isn't ready yet."""
+        thumbnail = self._thumbnails.get(path)
+        if thumbnail is not None:
+            self._thumbnails.move_to_end(path)
+            return thumbnail
+
+        with self._lock:
+            if path not in self._ready:
+                if path not in self._queued:
+                    self._queued.add(path)
+                    self._pending.append(path)
+                    self._wake.notify()
+                return None
+            thumbnail = self._ready.pop(path)
+        if thumbnail is None:
+            # Failed to load; remember it so it isn't retried every frame.
+            thumbnail = pygame.Surface(self.size, pygame.SRCALPHA)
+        elif pygame.display.get_init() and pygame.display.get_surface() is not None:
+            thumbnail = thumbnail.convert_alpha()
+        self._thumbnails[path] = thumbnail
+        while len(self._thumbnails) > self.max_in_memory:
+            self._thumbnails.popitem(last=False)
+        return thumbnail
+
+    def stop(self):
+        with self._lock:
+            self._stopping = True
+            self._wake.notify()
+        self._thread.join()
+
+    def _run(self):
+        os.makedirs(self.cache_folder, exist_ok=True)
+        while True:
+            with self._lock:
+                while not self._pending and not self._stopping:
+                    self._wake.wait()
+                if self._stopping:
+                    return
+                path = self._pending.pop()  # newest request first
+            thumbnail = self._make(path)
+            with self._lock:
+                self._queued.discard(path)
+                self._ready[path] = thumbnail
+                self.version += 1
+
+    def _make(self, path):
+        try:
+            cache_file = self._cache_file(path)
+            if os.path.isfile(cache_file):
+                return pygame.image.load(cache_file)
+
+            image = pygame.image.load(path)
+            if image.get_bitsize() < 24:
+                # smoothscale needs 24/32-bit pixels; convert() needs a display.
+                full = pygame.Surface(image.get_size(), pygame.SRCALPHA)
+                full.blit(image, (0, 0))
+                image = full
+            thumbnail = pygame.transform.smoothscale(image, self.size)
+            temp = cache_file + ".tmp.png"
+            pygame.image.save(thumbnail, temp)
+            os.replace(temp, cache_file)
+            return thumbnail
+        except Exception as e:
+            print(f"Failed to load image {os.path.basename(path)}: {e}")
+            return None
+
+    def _cache_file(self, path):
+        stat = os.stat(path)
+        key = f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}|{self.size[0]}x{self.size[1]}"
+        return os.path.join(self.cache_folder, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".png")
@@ -1,25 +1,117 @@
+from array import array
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+
+
 class Keyframe:
+    __slots__ = ("time", "angle")
+
     def __init__(self, time, angle):
         self.time = time
         self.angle = angle
 
+
 class Timeline:
+    """
+    Keyframes are stored as two parallel, time-sorted arrays of doubles.
+    Lookups are O(log n) via bisect, with a cached segment hint so playback
+    that moves forward a little each frame usually skips the search entirely.
+    """
+
     def __init__(self):
-        self.keyframes = []
-    
+        self.times = array("d")
+        self.angles = array("d")
+        self._hint = 0
+        # Bumped on every edit so views (e.g. the timeline strip) can tell
+        # when their cached rendering of this track is stale.
+        self.version = 0
+
+    @classmethod
+    def from_arrays(cls, times, angles):
+        """
+        Build a timeline from key arrays that are already sorted by time.
+
+        `times` and `angles` may be any float sequence or buffer (NumPy
+        arrays, views into a file's bytes); they're copied into the
+        timeline's own arrays in bulk, without a Python object per key.
+        """
+        times = np.ascontiguousarray(times, dtype=np.float64)
+        angles = np.ascontiguousarray(angles, dtype=np.float64)
+        if times.shape != angles.shape or times.ndim != 1:
+            raise ValueError("times and angles must be 1-D arrays of the same length")
+        timeline = cls()
+        timeline.times.frombytes(memoryview(times).cast("B"))
+        timeline.angles.frombytes(memoryview(angles).cast("B"))
+        timeline.version += 1
+        return timeline
+
+    def __len__(self):
+        return len(self.times)
+
+    @property
+    def keyframes(self):
+        """Keyframe views in time order (built on demand, not stored)."""
+        return [Keyframe(t, a) for t, a in zip(self.times, self.angles)]
+
     def add_keyframe(self, time, angle):
-        self.keyframes.append(Keyframe(time, angle))
-        self.keyframes.sort(key=lambda k: k.time)
+        # bisect_right keeps insertion order for keys sharing the same time,
+        # matching the old append + stable sort behaviour.
+        i = bisect_right(self.times, time)
+        self.times.insert(i, time)
+        self.angles.insert(i, angle)
+        self.version += 1
+
+    def _segment(self, time):
+        """Index i such that times[i - 1] < time <= times[i] (1 <= i < n)."""
+        times = self.times
+        i = self._hint
+        if 0 < i < len(times) and times[i - 1] < time <= times[i]:
+            return i
+        i += 1
+        if 0 < i < len(times) and times[i - 1] < time <= times[i]:
+            self._hint = i
+            return i
+        i = bisect_left(times, time)
+        self._hint = i
+        return i
 
     def get_angle_at(self, time, default=None):
-        if not self.keyframes:
+        times = self.times
+        angles = self.angles
+        n = len(times)
+        if not n:
             return default if default is not None else 0
-        if len(self.keyframes) == 1 or time <= self.keyframes[0].time:
-            return self.keyframes[0].angle
-        for i in range(len(self.keyframes) - 1):
-            k1 = self.keyframes[i]
-            k2 = self.keyframes[i + 1]
-            if k1.time <= time <= k2.time:
-                t = (time - k1.time) / (k2.time - k1.time)
-                return k1.angle * (1 - t) + k2.angle * t
-        return self.keyframes[-1].angle
+        if n == 1 or time <= times[0]:
+            return angles[0]
+        if time > times[-1]:
+            return angles[-1]
+        i = self._segment(time)
+        t0 = times[i - 1]
+        t = (time - t0) / (times[i] - t0)
+        return angles[i - 1] * (1 - t) + angles[i] * t
+
+    def sample_many(self, times, default=None):
+        """
+        Vectorised get_angle_at: interpolate the track at every time in
+        `times` in one NumPy pass. Clamping and default handling match
+        get_angle_at exactly. Returns a float64 ndarray shaped like `times`.
+        """
+        query = np.asarray(times, dtype=np.float64)
+        n = len(self.times)
+        if not n:
+            return np.full(query.shape, default if default is not None else 0, dtype=np.float64)
+        key_times = np.frombuffer(self.times, dtype=np.float64)
+        key_angles = np.frombuffer(self.angles, dtype=np.float64)
+        if n == 1:
+            return np.full(query.shape, key_angles[0])
+
+        i = np.clip(np.searchsorted(key_times, query, side="left"), 1, n - 1)
+        t0 = key_times[i - 1]
+        span = key_times[i] - t0
+        # Only clamped positions can have a zero span; they're overwritten below.
+        t = np.divide(query - t0, span, out=np.zeros_like(query), where=span != 0)
+        result = key_angles[i - 1] * (1 - t) + key_angles[i] * t
+        result[query <= key_times[0]] = key_angles[0]
+        result[query > key_times[-1]] = key_angles[-1]
+        return result